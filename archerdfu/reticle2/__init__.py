@@ -1,5 +1,9 @@
-from archerdfu.reticle2.decode import loads, load, Reticle2DecodeError
+from archerdfu.reticle2.decode import loads, load, load_mmap, iter_frames, Reticle2DecodeError
 from archerdfu.reticle2.encode import dumps, dump, Reticle2EncodeError
-from archerdfu.reticle2.helpers import mksmall, mkhold
+from archerdfu.reticle2.helpers import mksmall, mkhold, mkhold_cache_info, set_mkhold_cache_size, overlay, mkzooms
+from archerdfu.reticle2.info import inspect, Reticle2Info
+from archerdfu.reticle2.patching import patch, rebuild
 from archerdfu.reticle2.reticle2 import Reticle2Container, Reticle2ListContainer, Reticle2, Reticle2Frame
+from archerdfu.reticle2.runtable import RunTable
 from archerdfu.reticle2.typedefs import PXL4ID, PXL8ID
+from archerdfu.reticle2.writer import Reticle2Writer
@@ -0,0 +1,6 @@
+import sys
+
+from archerdfu.reticle2.batch import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,13 @@
 from operator import index
 
 
+def _restore_fixed_size_list(cls, items, size, filler):
+    return cls._trusted(items, size, filler)
+
+
 class FixedSizeList(list):
+    __slots__ = ('_size', 'filler')
+
     def __init__(self, *items, size=8, filler=None):
         self._size = size
         self.filler = filler
@@ -15,6 +21,17 @@ class FixedSizeList(list):
             initial_items = [filler] * size
         super().__init__(initial_items)
 
+    @classmethod
+    def _trusted(cls, items, size=8, filler=None):
+        """Builds the list from items known to be valid, no more than size of them, skipping the checks"""
+        obj = list.__new__(cls)
+        list.extend(obj, items)
+        if len(obj) < size:
+            list.extend(obj, [filler] * (size - len(obj)))
+        obj._size = size
+        obj.filler = filler
+        return obj
+
     def append(self, item):
         raise ValueError("Cannot append to a fixed-size list")
 
@@ -40,6 +57,10 @@ class FixedSizeList(list):
     def remove(self, value):
         self[index] = self.filler
 
+    def __reduce__(self):
+        # append and extend are disabled, so items are restored bypassing them
+        return _restore_fixed_size_list, (self.__class__, list(self), self._size, self.filler)
+
     def __repr__(self):
         return f"<{self.__class__.__name__}({super().__repr__()})>"
 
@@ -1,5 +1,9 @@
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from typing_extensions import Optional
 
 SQUARE = [[-1, -1, 3],
           [-1, 0, 1],
@@ -249,3 +253,101 @@ def create_hold_reticle(distances, zero, click_micron, zoom=1, y_shift=9, subson
         img_data = macro + img_data
     img_data.append(END_ITEM)
     return img_data
+
+
+# array based generator, produces the same records as create_hold_reticle
+
+def _table(t) -> np.ndarray:
+    return np.array(t, np.int64).reshape(-1, 3)
+
+
+SQUARE_TABLE = _table(SQUARE)
+CROSS5_TABLE = _table(CROSS5)
+BIRD_TABLE = _table(BIRD)
+CROSS3_TABLE = _table(CROSS3)
+VLINE5_TABLE = _table(VLINE5)
+NUMBER_TABLE = {k: _table(v) for k, v in NUMBER.items()}
+
+END_RECORD = np.array([tuple(END_ITEM)], np.int64)
+
+
+def _elements(*elements: tuple[int, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Joins (mil, table) elements to one table and the mil of every its item"""
+    items = np.concatenate([table for _, table in elements])
+    mils = np.repeat([float(mil) for mil, _ in elements], [len(table) for _, table in elements])
+    return items, mils
+
+
+def _number_table(number: str) -> np.ndarray:
+    """Digits are placed right to left, each next one is moved left by the font size and spacing"""
+    digits = []
+    for i, digit in enumerate(number[::-1]):
+        table = NUMBER_TABLE[digit].copy()
+        table[:, 0] -= i * (FONT_SIZE + FONT_SPASING)
+        digits.append(table)
+    return np.concatenate(digits)
+
+
+def create_row_table(distance, zero=100, subsonic=False) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """Array version of create_row, returns the (x, y, q) items of the row and the mil of every item"""
+    if distance == zero:
+        return _elements(*((x, VLINE5_TABLE) for x in range(-5, 0)),
+                         (0, BIRD_TABLE),
+                         *((x, VLINE5_TABLE) for x in range(1, 6)))
+    elif distance % 100 == 0:
+        if subsonic:
+            number = (-5, _number_table(str(distance // 1)))
+        else:
+            number = (-3, _number_table(str(distance // 100)))
+        return _elements(number, (-1, SQUARE_TABLE), (0, CROSS5_TABLE), (1, SQUARE_TABLE))
+    elif distance % 100 == 50:
+        return _elements((0, CROSS3_TABLE))
+    return None
+
+
+ROW_CACHE_SIZE = 1024
+
+
+def _frozen_row_table(distance, zero=100, subsonic=False) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    row = create_row_table(distance, zero, subsonic)
+    if row is not None:
+        for table in row:
+            table.flags.writeable = False
+    return row
+
+
+# rows only depend on (distance, zero, subsonic), mil and y offsets are applied per call
+_row_cache = lru_cache(maxsize=ROW_CACHE_SIZE)(_frozen_row_table)
+
+
+def row_cache_info():
+    """hits, misses, maxsize and currsize of the row cache"""
+    return _row_cache.cache_info()
+
+
+def set_row_cache_size(maxsize: Optional[int] = ROW_CACHE_SIZE) -> None:
+    """Replaces the row cache with an empty one of the given size, 0 disables caching, None makes it unbounded"""
+    global _row_cache
+    _row_cache = lru_cache(maxsize=maxsize)(_frozen_row_table)
+
+
+def create_hold_table(distances, zero, click_micron, zoom=1, y_shift=9, subsonic=False) -> np.ndarray:
+    """Array version of create_hold_reticle, returns (n, 3) table of x, y, q records in the same order"""
+    mil = 10000 / click_micron * zoom
+    blocks = []
+    y = 0
+    for d in distances:
+        row = _row_cache(d, zero, subsonic)
+        if row is not None:
+            items, mils = row
+            block = np.empty((len(items) + 3, 3), np.int64)
+            block[:3] = ((700, round(d / 10), 0), (700, 0, 0), (700, y, 0))
+            block[3:] = items
+            block[3:, 0] += np.round(mil * mils).astype(np.int64) + 320
+            block[3:, 1] += y + 240
+            blocks.append(block)
+            y += y_shift
+    # the rows are stacked from the last distance to the first one
+    blocks.reverse()
+    blocks.append(END_RECORD)
+    return np.concatenate(blocks)
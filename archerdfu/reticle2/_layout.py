@@ -0,0 +1,110 @@
+"""struct based reader and writer of the reticle2 file layout, mirrors the construct definitions in typedefs"""
+
+import struct
+from collections import namedtuple
+from itertools import chain
+
+from typing_extensions import Union, Sequence
+
+from archerdfu.reticle2 import instrumentation
+from archerdfu.reticle2.typedefs import (PXL4ID, PXL8ID, PXL4_ZOOM_COUNT, PXL8_ZOOM_COUNT,
+                                         TReticle2FileHeaderSize, TReticle2IndexSize)
+
+TBuffer = Union[bytes, bytearray, memoryview]
+
+SECTIONS = ('small', 'hold', 'base', 'lrf')
+
+HEADER_FORMAT = struct.Struct('<4si7Ii6I')
+LEGACY_HEADER_FORMAT = struct.Struct('<4siI')
+INDEX_FORMAT = struct.Struct('<II')
+
+assert HEADER_FORMAT.size == TReticle2FileHeaderSize
+assert INDEX_FORMAT.size == TReticle2IndexSize
+
+Reticle2Header = namedtuple('Reticle2Header', (
+    'PXLId', 'ReticleCount', 'SizeOfAllDataPXL2',
+    'SmallCount', 'OffsetSmall', 'SmallSize',
+    'HoldOffCount', 'OffsetHoldOff', 'HoldOffSize', 'HoldOffCrc',
+    'BaseCount', 'OffsetBase', 'BaseSize',
+    'LrfCount', 'OffsetLrf', 'LrfSize',
+))
+
+ZOOM_COUNTS = {
+    PXL4ID: PXL4_ZOOM_COUNT,
+    PXL8ID: PXL8_ZOOM_COUNT,
+}
+
+
+def zoom_count(pxl_id: bytes) -> int:
+    try:
+        return ZOOM_COUNTS[pxl_id]
+    except KeyError:
+        raise TypeError("Unsupported reticle2 type {!r}".format(pxl_id)) from None
+
+
+def section_counts(header: Reticle2Header) -> dict[str, int]:
+    return {
+        'small': header.SmallCount,
+        'hold': header.HoldOffCount,
+        'base': header.BaseCount,
+        'lrf': header.LrfCount,
+    }
+
+
+def head_size(header: Reticle2Header) -> int:
+    """Size of the header and the index, frame data starts after it"""
+    return HEADER_FORMAT.size + sum(section_counts(header).values()) * zoom_count(header.PXLId) * INDEX_FORMAT.size
+
+
+def parse_header(buffer: TBuffer) -> Reticle2Header:
+    recorder = instrumentation.recorder
+    start = instrumentation.perf_counter() if recorder is not None else 0
+    if len(buffer) < HEADER_FORMAT.size:
+        raise ValueError("Buffer is too short for the reticle2 header")
+    header = Reticle2Header._make(HEADER_FORMAT.unpack_from(buffer))
+    zoom_count(header.PXLId)
+    if recorder is not None:
+        recorder.add_time('parse_header', instrumentation.perf_counter() - start)
+    return header
+
+
+def parse_index(buffer: TBuffer, header: Reticle2Header) -> dict[str, list[tuple[tuple[int, int], ...]]]:
+    """Returns (offset, quant) entries grouped per reticle for each section"""
+    recorder = instrumentation.recorder
+    start = instrumentation.perf_counter() if recorder is not None else 0
+    zooms = zoom_count(header.PXLId)
+    entry_size = INDEX_FORMAT.size * zooms
+    offset = HEADER_FORMAT.size
+    index = {}
+    for key, count in section_counts(header).items():
+        end = offset + count * entry_size
+        if len(buffer) < end:
+            raise ValueError("Buffer is too short for the reticle2 index")
+        entries = tuple(INDEX_FORMAT.iter_unpack(buffer[offset:end]))
+        index[key] = [entries[i:i + zooms] for i in range(0, len(entries), zooms)]
+        offset = end
+    if recorder is not None:
+        recorder.add_time('parse_index', instrumentation.perf_counter() - start)
+    return index
+
+
+def parse_head(buffer: TBuffer) -> tuple[Reticle2Header, dict[str, list[tuple[tuple[int, int], ...]]]]:
+    header = parse_header(buffer)
+    return header, parse_index(buffer, header)
+
+
+def pack(header_format: struct.Struct, header: Sequence, index: Sequence[tuple[int, int]],
+         chunks: Sequence[TBuffer]) -> bytes:
+    """Writes the header, the flat (offset, quant) index and the frame data into a buffer allocated once"""
+    data_offset = header_format.size + len(index) * INDEX_FORMAT.size
+    buffer = bytearray(data_offset + sum(map(len, chunks)))
+    try:
+        header_format.pack_into(buffer, 0, *header)
+        struct.pack_into(f'<{len(index) * 2}I', buffer, header_format.size, *chain.from_iterable(index))
+    except struct.error as e:
+        raise ValueError(str(e)) from e
+    for chunk in chunks:
+        end = data_offset + len(chunk)
+        buffer[data_offset:end] = chunk
+        data_offset = end
+    return bytes(buffer)
@@ -0,0 +1,138 @@
+"""
+asyncio API, file I/O runs in threads and the decode, encode and image work runs in a configurable executor
+
+    aio.configure(ProcessPoolExecutor(), max_concurrency=8)
+    container = await aio.load('foo.pxl4', load_hold=True)
+    await aio.dump(container, 'foo.pxl8', PXL8ID)
+"""
+
+import asyncio
+import io
+import os
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+
+from PIL import Image
+from typing_extensions import IO, Any, Optional, Union, Iterable
+
+from archerdfu.reticle2 import decode, encode
+from archerdfu.reticle2.reticle2 import Reticle2Container, Reticle2Frame
+from archerdfu.reticle2.typedefs import Reticle2Type, PXL4ID
+
+__all__ = ('configure', 'loads', 'load', 'dumps', 'dump', 'save')
+
+TSource = Union[str, os.PathLike[str], IO[bytes]]
+
+_executor: Optional[Executor] = None
+_max_concurrency: Optional[int] = None
+_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = weakref.WeakKeyDictionary()
+
+
+def configure(executor: Optional[Executor] = None, max_concurrency: Optional[int] = None) -> None:
+    """
+    Sets the executor for the CPU bound work, None uses the default executor of the loop (threads),
+    and the limit of operations running at once, None for no limit
+    """
+    global _executor, _max_concurrency
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer or None")
+    _executor = executor
+    _max_concurrency = max_concurrency
+    _semaphores.clear()
+
+
+class _Unlimited:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+def _limit():
+    if _max_concurrency is None:
+        return _Unlimited()
+    # a semaphore is bound to the loop it is first used in
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return semaphore
+
+
+async def _run(executor: Optional[Executor], func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _executor, partial(func, *args, **kwargs))
+
+
+def _read(__src: TSource) -> bytes:
+    if hasattr(__src, 'read'):
+        if 'b' not in getattr(__src, 'mode', ''):
+            raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'rb')`") from None
+        return __src.read()
+    return Path(__src).read_bytes()
+
+
+def _write(__dest: TSource, data: bytes) -> None:
+    if hasattr(__dest, 'write'):
+        if 'b' not in getattr(__dest, 'mode', ''):
+            raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'wb')`") from None
+        __dest.write(data)
+    else:
+        Path(__dest).write_bytes(data)
+
+
+def _render(frame: Reticle2Frame, format: str, params: dict[str, Any]) -> bytes:
+    out = io.BytesIO()
+    frame.save(out, format, **params)
+    return out.getvalue()
+
+
+async def loads(__b: bytes, *, load_hold: bool = False,
+                sections: Optional[Iterable[str]] = None,
+                reticles: Optional[Iterable[int]] = None,
+                zooms: Optional[Iterable[int]] = None,
+                executor: Optional[Executor] = None) -> Reticle2Container:
+    async with _limit():
+        return await _run(executor, decode.loads, bytes(__b), load_hold=load_hold,
+                          sections=sections, reticles=reticles, zooms=zooms)
+
+
+async def load(__src: TSource, *, load_hold: bool = False, executor: Optional[Executor] = None,
+               **selection) -> Reticle2Container:
+    """__src is a path or a file opened in binary mode"""
+    async with _limit():
+        b = await asyncio.to_thread(_read, __src)
+        return await _run(executor, decode.loads, b, load_hold=load_hold, **selection)
+
+
+async def dumps(__o: Reticle2Container, __type: Reticle2Type = PXL4ID, *,
+                dump_hold: bool = False, dedup: bool = False,
+                executor: Optional[Executor] = None) -> bytes:
+    async with _limit():
+        return await _run(executor, encode.dumps, __o, __type, dump_hold=dump_hold, dedup=dedup)
+
+
+async def dump(__o: Reticle2Container, __dest: TSource, __type: Reticle2Type = PXL4ID, *,
+               dump_hold: bool = False, dedup: bool = False,
+               executor: Optional[Executor] = None) -> None:
+    """__dest is a path or a file opened in binary mode"""
+    async with _limit():
+        b = await _run(executor, encode.dumps, __o, __type, dump_hold=dump_hold, dedup=dedup)
+        await asyncio.to_thread(_write, __dest, b)
+
+
+async def save(__frame: Reticle2Frame, __dest: TSource, format: Optional[str] = None, *,
+               executor: Optional[Executor] = None, **params: Any) -> None:
+    """Async Reticle2Frame.save, the format is taken from the file extension if not given"""
+    if format is None:
+        name = getattr(__dest, 'name', __dest)
+        try:
+            format = Image.registered_extensions()[os.path.splitext(os.fspath(name))[1].lower()]
+        except (KeyError, TypeError):
+            raise ValueError("Unknown image format, pass the format argument") from None
+    async with _limit():
+        b = await _run(executor, _render, __frame, format, params)
+        await asyncio.to_thread(_write, __dest, b)
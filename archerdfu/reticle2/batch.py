@@ -0,0 +1,217 @@
+"""parallel batch conversion of reticle2 files across directory trees"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from typing_extensions import Literal, Optional, Union
+
+from archerdfu.reticle2 import pxl2, pxl3
+from archerdfu.reticle2.decode import loads
+from archerdfu.reticle2.encode import dumps
+from archerdfu.reticle2.helpers import mksmall
+from archerdfu.reticle2.reticle2 import Reticle2Container, Reticle2ListContainer, Reticle2
+from archerdfu.reticle2.typedefs import PXL4ID, PXL8ID
+
+__all__ = ('batch', 'main', 'BatchStats')
+
+TOperation = Literal['extract', 'repack', 'legacy']
+
+SUFFIXES = {
+    'extract': ('.pxl2', '.pxl3', '.pxl4', '.pxl8'),
+    'repack': ('.pxl4', '.pxl8'),
+    'legacy': ('.pxl2', '.pxl3'),
+}
+
+PXL_TYPES = {
+    'pxl4': PXL4ID,
+    'pxl8': PXL8ID,
+}
+
+
+@dataclass
+class _JobResult:
+    src: Path
+    frames: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    frames: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    elapsed: float = 0
+    errors: list[tuple[Path, str]] = field(default_factory=list)
+
+    def add(self, result: _JobResult) -> None:
+        if result.error is not None:
+            self.errors.append((result.src, result.error))
+            return
+        self.files += 1
+        self.frames += result.frames
+        self.bytes_in += result.bytes_in
+        self.bytes_out += result.bytes_out
+
+    def __str__(self):
+        elapsed = self.elapsed or float('nan')
+        return (f"{self.files} files, {self.frames} frames, "
+                f"{self.bytes_in / 2 ** 20:.2f} MiB in, {self.bytes_out / 2 ** 20:.2f} MiB out, "
+                f"{len(self.errors)} errors in {self.elapsed:.2f}s "
+                f"({self.files / elapsed:.1f} files/s, {self.frames / elapsed:.1f} frames/s)")
+
+
+def _load_any(buffer: bytes, load_hold: bool) -> Reticle2Container:
+    """Loads any of PXL2/PXL3/PXL4/PXL8, legacy reticles are placed to the base section"""
+    if buffer[:4] == pxl3.PXL3ID:
+        return Reticle2Container(base=pxl3.loads(buffer))
+    if buffer[:4] == pxl2.PXL2ID:
+        return Reticle2Container(base=pxl2.loads(buffer))
+    return loads(buffer, load_hold=load_hold)
+
+
+def _extract(result: _JobResult, buffer: bytes, dest: Path, image_format: str, hold: bool) -> None:
+    container = _load_any(buffer, hold)
+    dest.mkdir(parents=True, exist_ok=True)
+    for key, reticles in container.items():
+        for i, reticle in enumerate(reticles or ()):
+            for j, frame in enumerate(reticle):
+                if frame is None or len(frame) <= 0 or (j != 0 and reticle[0] == frame):
+                    continue
+                path = dest / f"{key}_{i + 1}_{j + 1}.{image_format}"
+                frame.save(path)
+                frame.release()
+                result.frames += 1
+                result.bytes_out += path.stat().st_size
+
+
+def _write(result: _JobResult, container: Reticle2Container, dest: Path, pxl_type: bytes, hold: bool) -> None:
+    buffer = dumps(container, pxl_type, dump_hold=hold)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(buffer)
+    result.frames = sum(frame is not None for reticles in container.values() if reticles
+                        for reticle in reticles for frame in reticle)
+    result.bytes_out = len(buffer)
+
+
+def _run_job(job: tuple) -> _JobResult:
+    operation, src, dest, options = job
+    result = _JobResult(src)
+    try:
+        buffer = src.read_bytes()
+        result.bytes_in = len(buffer)
+        if operation == 'extract':
+            _extract(result, buffer, dest, options['image_format'], options['hold'])
+        elif operation == 'repack':
+            container = loads(buffer, load_hold=options['hold'])
+            _write(result, container, dest, options['pxl_type'], options['hold'])
+        elif operation == 'legacy':
+            container = _load_any(buffer, False)
+            container['small'] = Reticle2ListContainer(Reticle2(mksmall()))
+            _write(result, container, dest, options['pxl_type'], False)
+        else:
+            raise ValueError("Unknown operation {!r}".format(operation))
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _collect(src: Path, suffixes: tuple[str, ...]) -> list[tuple[Path, Path]]:
+    """Returns (file, path relative to src) pairs"""
+    if src.is_file():
+        return [(src, Path(src.name))]
+    return [(path, path.relative_to(src)) for path in sorted(src.rglob('*'))
+            if path.is_file() and path.suffix.lower() in suffixes]
+
+
+def _destination(operation: TOperation, dest: Path, rel: Path, pxl_type: bytes) -> Path:
+    if operation == 'extract':
+        return dest / rel
+    return dest / rel.with_suffix(_suffix(pxl_type))
+
+
+def _suffix(pxl_type: bytes) -> str:
+    return '.' + pxl_type.decode().lower()
+
+
+def batch(operation: TOperation,
+          src: Union[str, os.PathLike[str]],
+          dest: Union[str, os.PathLike[str]], *,
+          workers: Optional[int] = None,
+          chunksize: int = 1,
+          image_format: str = 'bmp',
+          pxl_type: bytes = PXL4ID,
+          hold: bool = False) -> BatchStats:
+    """
+    Runs the operation for every matching file under src, writing results under dest with the same layout:
+        extract - every frame to a {file name}/{section}_{reticle}_{zoom}.{image_format} image
+        repack  - PXL4 to PXL8 or PXL8 to PXL4, whichever is not pxl_type
+        legacy  - PXL2/PXL3 to pxl_type, the reticles go to the base section
+    Files are processed by a pool of `workers` processes (all cores by default), workers=1 runs in-process
+    """
+    if operation not in SUFFIXES:
+        raise ValueError("Unknown operation {!r}".format(operation))
+    if pxl_type not in PXL_TYPES.values():
+        raise TypeError("Unsupported reticle2 type {!r}".format(pxl_type))
+
+    suffixes = SUFFIXES[operation]
+    if operation == 'repack':
+        suffixes = tuple(suffix for suffix in suffixes if suffix != _suffix(pxl_type))
+
+    src, dest = Path(src), Path(dest)
+    options = {'image_format': image_format, 'pxl_type': pxl_type, 'hold': hold}
+    jobs = [(operation, path, _destination(operation, dest, rel, pxl_type), options)
+            for path, rel in _collect(src, suffixes)]
+
+    stats = BatchStats()
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        for result in map(_run_job, jobs):
+            stats.add(result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_run_job, jobs, chunksize=chunksize):
+                stats.add(result)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='reticle2')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = commands.add_parser('batch', help="convert whole directory trees in parallel")
+    batch_parser.add_argument('operation', choices=tuple(SUFFIXES),
+                              help="extract frames to images, repack PXL4<->PXL8, or convert legacy PXL2/PXL3")
+    batch_parser.add_argument('src', type=Path, help="source file or directory")
+    batch_parser.add_argument('dest', type=Path, help="destination directory")
+    batch_parser.add_argument('-j', '--workers', type=int, default=None,
+                              help="number of worker processes, defaults to the number of cores")
+    batch_parser.add_argument('--chunksize', type=int, default=1, help="files per worker task")
+    batch_parser.add_argument('--format', dest='image_format', choices=('bmp', 'png'), default='bmp',
+                              help="image format for extract")
+    batch_parser.add_argument('--to', dest='pxl_type', choices=tuple(PXL_TYPES), default='pxl4',
+                              help="output format for repack and legacy")
+    batch_parser.add_argument('--hold', action='store_true', help="include the hold-off section")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    stats = batch(args.operation, args.src, args.dest,
+                  workers=args.workers,
+                  chunksize=args.chunksize,
+                  image_format=args.image_format,
+                  pxl_type=PXL_TYPES[args.pxl_type],
+                  hold=args.hold)
+    for path, error in stats.errors:
+        print(f"{path}: {error}", file=sys.stderr)
+    print(stats)
+    return 1 if stats.errors else 0
@@ -1,7 +1,10 @@
+import mmap
+from os import PathLike
+
 from construct import ConstructError
-from typing_extensions import IO, Any
+from typing_extensions import IO, Any, Union, Optional, Iterable, Iterator
 
-from archerdfu.reticle2.reticle2 import Reticle2Container
+from archerdfu.reticle2.reticle2 import Reticle2Container, Reticle2Frame, TWorkers, _Compressor
 
 
 class DEPRECATED_DEFAULT:
@@ -42,20 +45,61 @@ class Reticle2DecodeError(ValueError):
             return
 
 
-def loads(__b: bytes, *, load_hold: bool = False):
+def loads(__b: Union[bytes, memoryview], *, load_hold: bool = False,
+          sections: Optional[Iterable[str]] = None,
+          reticles: Optional[Iterable[int]] = None,
+          zooms: Optional[Iterable[int]] = None,
+          workers: TWorkers = None):
+    """
+    sections, reticles and zooms restrict decoding to the selected frames,
+    e.g. `loads(b, sections={'base'}, reticles=[3], zooms=[0])`,
+    workers decodes the frame images up front on a thread pool of that size or on the given executor
+    """
     try:
-        return Reticle2Container.decode(__b, decode_hold=load_hold)
+        return Reticle2Container.decode(__b, decode_hold=load_hold,
+                                        sections=sections, reticles=reticles, zooms=zooms, workers=workers)
     except (ValueError, TypeError) as e:
         raise Reticle2DecodeError(str(e))
     except ConstructError as err:
         raise Reticle2DecodeError("File parsing error", path=err.path)
 
 
-def load(__fp: IO[bytes], *, load_hold: bool = False):
+def load(__fp: IO[bytes], *, load_hold: bool = False, **selection):
     if 'b' not in getattr(__fp, 'mode', ''):
         raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'rb')`") from None
     b = __fp.read()
-    return loads(b, load_hold=load_hold)
+    return loads(b, load_hold=load_hold, **selection)
+
+
+def load_mmap(__path: Union[str, PathLike[str]], *, load_hold: bool = False, **selection):
+    """Memory-maps the file, frames of the result are zero-copy views into the mapping"""
+    with open(__path, 'rb') as fp:
+        try:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            raise Reticle2DecodeError(str(e))
+    return loads(memoryview(buffer), load_hold=load_hold, **selection)
+
+
+def iter_frames(__src: Union[bytes, memoryview, IO[bytes]], *, load_hold: bool = False,
+                sections: Optional[Iterable[str]] = None,
+                reticles: Optional[Iterable[int]] = None,
+                zooms: Optional[Iterable[int]] = None) -> Iterator[tuple[str, int, int, Reticle2Frame]]:
+    """
+    Yields (section, reticle index, zoom, frame) in file order, the frames `loads` would set,
+    a file is read frame by frame instead of at once
+    """
+    if hasattr(__src, 'read') and 'b' not in getattr(__src, 'mode', ''):
+        raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'rb')`") from None
+
+    def _frames():
+        try:
+            yield from _Compressor.iter_decompress(__src, decompress_hold=load_hold,
+                                                   sections=sections, reticles=reticles, zooms=zooms)
+        except (ValueError, TypeError) as e:
+            raise Reticle2DecodeError(str(e))
+
+    return _frames()
 
 
 if __name__ == '__main__':
@@ -2,7 +2,7 @@ from construct import ConstructError
 from typing_extensions import IO, Any
 
 from archerdfu.reticle2.decode import DEPRECATED_DEFAULT
-from archerdfu.reticle2.reticle2 import Reticle2Container
+from archerdfu.reticle2.reticle2 import Reticle2Container, TWorkers
 from archerdfu.reticle2.typedefs import Reticle2Type, PXL4ID, PXL8ID
 
 
@@ -39,20 +39,23 @@ class Reticle2EncodeError(ValueError):
             return
 
 
-def dumps(__o: Reticle2Container, __type: Reticle2Type = PXL4ID, *, dump_hold: bool = False) -> bytes:
+def dumps(__o: Reticle2Container, __type: Reticle2Type = PXL4ID, *,
+          dump_hold: bool = False, dedup: bool = False, workers: TWorkers = None) -> bytes:
+    """workers encodes images set to frames on a thread pool of that size or on the given executor"""
     try:
         try:
-            return __o.encode(__type, encode_hold=dump_hold)
+            return __o.encode(__type, encode_hold=dump_hold, dedup=dedup, workers=workers)
         except ConstructError as err:
             raise Reticle2EncodeError("File building error", err.path)
     except (ValueError, TypeError) as e:
         raise Reticle2EncodeError(str(e))
 
 
-def dump(__o: Reticle2Container, __fp: IO[bytes], __type: Reticle2Type = PXL4ID, *, dump_hold: bool = False) -> None:
+def dump(__o: Reticle2Container, __fp: IO[bytes], __type: Reticle2Type = PXL4ID, *,
+         dump_hold: bool = False, dedup: bool = False, workers: TWorkers = None) -> None:
     if 'b' not in getattr(__fp, 'mode', ''):
         raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'wb')`") from None
-    b = dumps(__o, __type, dump_hold=dump_hold)
+    b = dumps(__o, __type, dump_hold=dump_hold, dedup=dedup, workers=workers)
     __fp.write(b)
 
 
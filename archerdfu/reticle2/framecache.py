@@ -0,0 +1,173 @@
+"""
+optional on-disk cache of decoded frames keyed by the digest of the RLE
+
+    framecache.enable('~/.cache/reticle2', max_size=256 * 2 ** 20)
+
+While enabled `rle.decode` and `Reticle2Frame.img` read rasters from the cache and store the ones they decode,
+while disabled they only check `active` against None. Rasters are kept as packed bits in two hex character
+shard directories, files are written to a temporary name and renamed, so several processes can share
+the directory, the least recently used files are removed when it grows over max_size.
+Only the shard directories and files of the cache are ever touched
+"""
+
+import os
+import re
+import tempfile
+import time
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from typing_extensions import Optional, Union, Iterator
+
+__all__ = ('FrameCache', 'enable', 'disable', 'active')
+
+DEFAULT_MAX_SIZE = 256 * 2 ** 20
+SUFFIX = '.bits'
+TMP_PREFIX = '.'
+TMP_SUFFIX = '.tmp'
+# temporary files older than this are left by crashed writers
+STALE_TMP_AGE = 3600
+
+_SHARD = re.compile(r'[0-9a-f]{2}')
+
+# the cache used by rle.decode, None when caching is off
+active: Optional['FrameCache'] = None
+
+
+class FrameCache:
+
+    def __init__(self, path: Union[str, os.PathLike[str]], max_size: int = DEFAULT_MAX_SIZE):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        # estimate of the directory size, other processes make it drift, eviction measures it again
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def key(buffer: Union[bytes, memoryview], size: tuple[int, int], digest: Optional[bytes] = None) -> str:
+        """digest is the blake2b digest of the buffer with digest_size=16, like Reticle2Frame.digest"""
+        if digest is None:
+            digest = blake2b(buffer, digest_size=16).digest()
+        width, height, *_ = size
+        return f"{digest.hex()}-{width}x{height}"
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / (key + SUFFIX)
+
+    def _shards(self) -> Iterator[Path]:
+        for directory in self.path.iterdir():
+            if _SHARD.fullmatch(directory.name) and directory.is_dir():
+                yield directory
+
+    def _entries(self) -> Iterator[Path]:
+        """Cached rasters of the shard directories"""
+        for directory in self._shards():
+            yield from directory.glob('*' + SUFFIX)
+
+    def _temporaries(self) -> Iterator[Path]:
+        """Files of unfinished stores, mkstemp names of the shard directories"""
+        for directory in self._shards():
+            yield from directory.glob(TMP_PREFIX + '*' + TMP_SUFFIX)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def load(self, key: str, size: tuple[int, int]) -> Optional[np.ndarray]:
+        """Returns the (height, width) bool mask of the covered pixels, None if it is not cached"""
+        width, height, *_ = size
+        file = self._file(key)
+        try:
+            data = file.read_bytes()
+        except OSError:
+            self._count(False)
+            return None
+        if len(data) != (width * height + 7) // 8:
+            self._count(False)
+            return None
+        try:
+            os.utime(file)
+        except OSError:
+            pass
+        self._count(True)
+        return np.unpackbits(np.frombuffer(data, np.uint8), count=width * height).view(bool).reshape(height, width)
+
+    def store(self, key: str, mask: np.ndarray) -> None:
+        file = self._file(key)
+        data = np.packbits(mask.ravel()).tobytes()
+        file.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=TMP_PREFIX, suffix=TMP_SUFFIX, dir=file.parent)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+            os.replace(tmp, file)
+        except OSError:
+            self._remove(Path(tmp))
+            return
+        with self._lock:
+            self._size += len(data)
+            over = self._size > self.max_size
+        if over:
+            self.evict()
+
+    def evict(self, target: Optional[int] = None) -> None:
+        """Removes least recently used rasters until the directory is under target, 90% of max_size by default"""
+        if target is None:
+            target = self.max_size * 9 // 10
+        now = time.time()
+        for entry in self._temporaries():
+            try:
+                if now - entry.stat().st_mtime > STALE_TMP_AGE:
+                    self._remove(entry)
+            except OSError:
+                continue
+
+        files = []
+        total = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        for _, file_size, entry in sorted(files, key=lambda f: f[0]):
+            if total <= target:
+                break
+            if self._remove(entry):
+                total -= file_size
+        with self._lock:
+            self._size = total
+
+    @staticmethod
+    def _remove(file: Path) -> bool:
+        try:
+            file.unlink()
+        except OSError:
+            return False
+        return True
+
+    def clear(self) -> None:
+        self.evict(0)
+
+
+def enable(path: Union[str, os.PathLike[str]], max_size: int = DEFAULT_MAX_SIZE) -> FrameCache:
+    global active
+    active = FrameCache(path, max_size)
+    return active
+
+
+def disable() -> None:
+    global active
+    active = None
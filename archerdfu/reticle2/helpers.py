@@ -1,12 +1,18 @@
-from archerdfu.reticle2.reticle2 import Reticle2Frame, rle
-from archerdfu.reticle2._hold_off import SMALL_RET, create_hold_reticle
+import numpy as np
+from typing_extensions import Optional, Iterable
 
-__all__ = ('mksmall', 'mkhold')
+from archerdfu.reticle2.reticle2 import Reticle2Frame, Reticle2, rle
+from archerdfu.reticle2.runtable import RunTable
+from archerdfu.reticle2.typedefs import PXL4_ZOOM_COUNT
+from archerdfu.reticle2._hold_off import SMALL_RET, ROW_CACHE_SIZE, create_hold_table, row_cache_info, \
+    set_row_cache_size
+
+__all__ = ('mksmall', 'mkhold', 'mkhold_cache_info', 'set_mkhold_cache_size', 'overlay', 'mkzooms')
 
 
 def _el2frame(els) -> Reticle2Frame:
-    buf = b''.join(rle.pack_record(*i) for i in els)
-    return Reticle2Frame(buf)
+    table = np.asarray(els, np.int64).reshape(-1, 3)
+    return Reticle2Frame(rle.pack_records(table[:, 0], table[:, 1], table[:, 2]).tobytes())
 
 
 def mksmall() -> Reticle2Frame:
@@ -14,5 +20,39 @@ def mksmall() -> Reticle2Frame:
 
 
 def mkhold(distances: tuple[int, ...] | list[int], zero: int, click_micron: int, zoom=1, *, subsonic=False):
-    els = create_hold_reticle(distances, zero, click_micron, zoom, subsonic=subsonic)
-    return _el2frame(els)
+    table = create_hold_table(distances, zero, click_micron, zoom, subsonic=subsonic)
+    return _el2frame(table)
+
+
+def mkhold_cache_info():
+    """Statistics of the LRU cache of hold-off rows shared by mkhold calls"""
+    return row_cache_info()
+
+
+def set_mkhold_cache_size(maxsize: Optional[int] = ROW_CACHE_SIZE) -> None:
+    """Resets the mkhold row cache with a new size limit, 0 disables it"""
+    set_row_cache_size(maxsize)
+
+
+def overlay(*frames: Reticle2Frame) -> Reticle2Frame:
+    """
+    Union of the frames computed on their runs, the result is canonical,
+    so the hold-off control records of mkhold frames are not kept
+    """
+    runs = RunTable()
+    for frame in frames:
+        runs = runs | frame.runs
+    return Reticle2Frame(runs)
+
+
+def mkzooms(master: Reticle2Frame, zoom_count: int = PXL4_ZOOM_COUNT, *,
+            factors: Optional[Iterable[int]] = None, origin: tuple[int, int] = (320, 240)) -> Reticle2:
+    """
+    Derives every zoom frame of a reticle from the zoom 1 master frame by scaling its runs around the origin,
+    zoom n is scaled by n unless other factors are given
+    """
+    if factors is None:
+        factors = range(1, zoom_count + 1)
+    runs = master.runs
+    return Reticle2(*(master if factor == 1 else Reticle2Frame(runs.scale(factor, origin))
+                      for factor in list(factors)[:zoom_count]))
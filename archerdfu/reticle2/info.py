@@ -0,0 +1,119 @@
+"""summary of reticle2 files read from the header and the index only, frame data is not touched"""
+
+import os
+from dataclasses import dataclass
+
+from typing_extensions import IO, Optional, Union
+
+from archerdfu.reticle2._layout import (parse_header, parse_index, head_size, section_counts, zoom_count,
+                                        Reticle2Header, HEADER_FORMAT, LEGACY_HEADER_FORMAT, INDEX_FORMAT)
+from archerdfu.reticle2.decode import Reticle2DecodeError
+from archerdfu.reticle2.pxl2 import PXL2ID, PXL2_ZOOM_COUNT
+from archerdfu.reticle2.pxl3 import PXL3ID, PXL3_ZOOM_COUNT
+from archerdfu.reticle2.typedefs import TReticle2DataSize
+
+__all__ = ('inspect', 'Reticle2Info')
+
+TIndex = dict[str, list[tuple[tuple[int, int], ...]]]
+
+LEGACY_ZOOM_COUNTS = {
+    PXL2ID: PXL2_ZOOM_COUNT,
+    PXL3ID: PXL3_ZOOM_COUNT,
+}
+
+
+@dataclass(frozen=True)
+class Reticle2Info:
+    """
+    pxl_id      - file magic, b'PXL2', b'PXL3', b'PXL4' or b'PXL8'
+    counts      - reticles per section, legacy files have the base section only
+    index       - (offset, quant) entries per reticle for each section
+    size        - SizeOfAllDataPXL2 of the header
+    header      - full PXL4/PXL8 header, None for legacy files
+    """
+    pxl_id: bytes
+    zoom_count: int
+    counts: dict[str, int]
+    index: TIndex
+    size: int
+    header: Optional[Reticle2Header] = None
+
+    @property
+    def frames(self) -> list[tuple[int, int]]:
+        """Distinct (offset, run count) entries in offset order, an empty frame can share the offset of the next one"""
+        return sorted({entry for reticles in self.index.values() for reticle in reticles for entry in reticle})
+
+    @property
+    def unique_offsets(self) -> int:
+        return len({offset for offset, _ in self.frames})
+
+    @property
+    def data_size(self) -> int:
+        """Bytes of frame data referenced by the index"""
+        return sum(quant for _, quant in self.frames) * TReticle2DataSize
+
+
+def _read_head(read) -> tuple[bytes, TIndex, int, Optional[Reticle2Header]]:
+    buffer = read(0, HEADER_FORMAT.size)
+    pxl_id = bytes(buffer[:4])
+
+    if pxl_id in LEGACY_ZOOM_COUNTS:
+        if len(buffer) < LEGACY_HEADER_FORMAT.size:
+            raise ValueError("Buffer is too short for the reticle2 header")
+        _, count, size = LEGACY_HEADER_FORMAT.unpack_from(buffer)
+        if count < 0:
+            raise ValueError("Negative reticle count {}".format(count))
+        zooms = LEGACY_ZOOM_COUNTS[pxl_id]
+        end = LEGACY_HEADER_FORMAT.size + count * zooms * INDEX_FORMAT.size
+        buffer = read(LEGACY_HEADER_FORMAT.size, end - LEGACY_HEADER_FORMAT.size)
+        if len(buffer) < end - LEGACY_HEADER_FORMAT.size:
+            raise ValueError("Buffer is too short for the reticle2 index")
+        entries = tuple(INDEX_FORMAT.iter_unpack(buffer))
+        return pxl_id, {'base': [entries[i:i + zooms] for i in range(0, len(entries), zooms)]}, size, None
+
+    header = parse_header(buffer)
+    return pxl_id, parse_index(read(0, head_size(header)), header), header.SizeOfAllDataPXL2, header
+
+
+def inspect(__src: Union[str, os.PathLike[str], IO[bytes], bytes, memoryview]) -> Reticle2Info:
+    """
+    Reads the header and the index of a PXL2/PXL3/PXL4/PXL8 file, a path or a binary file is read
+    with two seeks from its current position, buffers are not copied
+    """
+    if isinstance(__src, (bytes, bytearray, memoryview)):
+        buffer = memoryview(__src)
+
+        def read(offset: int, size: int):
+            return buffer[offset:offset + size]
+
+        return _inspect(read)
+
+    if hasattr(__src, 'read'):
+        if 'b' not in getattr(__src, 'mode', ''):
+            raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'rb')`") from None
+        return _inspect(_file_reader(__src))
+
+    with open(__src, 'rb') as fp:
+        return _inspect(_file_reader(fp))
+
+
+def _file_reader(fp: IO[bytes]):
+    start = fp.tell()
+
+    def read(offset: int, size: int) -> bytes:
+        fp.seek(start + offset)
+        return fp.read(size)
+
+    return read
+
+
+def _inspect(read) -> Reticle2Info:
+    try:
+        pxl_id, index, size, header = _read_head(read)
+    except (ValueError, TypeError) as e:
+        raise Reticle2DecodeError(str(e))
+    if header is None:
+        counts, zooms = {'base': len(index['base'])}, LEGACY_ZOOM_COUNTS[pxl_id]
+    else:
+        counts, zooms = section_counts(header), zoom_count(pxl_id)
+    return Reticle2Info(pxl_id, zooms, counts, index, size, header)
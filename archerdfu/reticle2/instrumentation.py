@@ -0,0 +1,79 @@
+"""
+opt-in timings and counters of the decode and encode stages
+
+    with instrumentation.record() as recorder:
+        dumps(loads(b), dedup=True)
+    print(recorder.as_dict())
+
+Recording is process-wide and off by default, the hot paths only check `recorder` against None.
+Stages nest, e.g. 'decompress' includes 'parse_header', 'parse_index' and 'slice'
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+
+from typing_extensions import Optional, Iterator
+
+__all__ = ('Recorder', 'record', 'recorder', 'perf_counter')
+
+# the active recorder, None when recording is off
+recorder: Optional['Recorder'] = None
+
+
+@dataclass
+class Recorder:
+    timings: dict[str, float] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @property
+    def dedup_hit_rate(self) -> Optional[float]:
+        """Share of written frames found in the dedup table, None if dedup was not used"""
+        hits = self.counters.get('dedup_hits', 0)
+        total = hits + self.counters.get('dedup_misses', 0)
+        return hits / total if total else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timings.clear()
+            self.calls.clear()
+            self.counters.clear()
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                'timings': dict(self.timings),
+                'calls': dict(self.calls),
+                'counters': dict(self.counters),
+                'dedup_hit_rate': self.dedup_hit_rate,
+            }
+
+    def __str__(self):
+        lines = [f"{stage:<20} {self.timings[stage] * 1000:>10.3f} ms {self.calls[stage]:>8} calls"
+                 for stage in sorted(self.timings)]
+        lines.extend(f"{name:<20} {value:>13}" for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record(__recorder: Optional[Recorder] = None) -> Iterator[Recorder]:
+    """Activates a recorder (a new one by default) for the block, the previous one is restored after it"""
+    global recorder
+    previous = recorder
+    recorder = __recorder if __recorder is not None else Recorder()
+    try:
+        yield recorder
+    finally:
+        recorder = previous
@@ -0,0 +1,162 @@
+"""in-place replacement of single reticles in PXL4/PXL8 files"""
+
+import os
+from bisect import bisect_left
+from pathlib import Path
+
+from typing_extensions import IO, Optional, Union
+
+from archerdfu.reticle2._layout import parse_head, parse_header, section_counts, zoom_count, HEADER_FORMAT, \
+    INDEX_FORMAT, SECTIONS
+from archerdfu.reticle2.decode import loads
+from archerdfu.reticle2.encode import dumps, Reticle2EncodeError
+from archerdfu.reticle2.reticle2 import _Compressor, Reticle2, Reticle2Frame
+from archerdfu.reticle2.typedefs import TReticle2DataSize
+
+__all__ = ('patch', 'rebuild')
+
+
+class _PatchCompressor(_Compressor):
+    """Places new frames into free regions of the file first, the rest is appended to its end"""
+
+    def __init__(self, fp: Optional[IO[bytes]] = None, start: int = 0, end: int = 0,
+                 free: Optional[list[tuple[int, int]]] = None):
+        super().__init__()
+        self._fp = fp
+        self._start = start
+        self.offset = end
+        self._free = free or []
+
+    def _store(self, frame: Reticle2Frame) -> tuple[int, int]:
+        size = len(frame)
+        for i, (offset, free_size) in enumerate(self._free):
+            if size <= free_size:
+                self._free[i] = offset + size, free_size - size
+                break
+        else:
+            offset = self.offset
+            self.offset += size
+        self._fp.seek(self._start + offset)
+        self._fp.write(frame.rle)
+        return offset, size // TReticle2DataSize
+
+
+def _free_regions(entries: list[tuple[int, int]], released: range) -> list[tuple[int, int]]:
+    """(offset, size) of the data of released entries that no other entry overlaps"""
+    kept = sorted((offset, offset + quant * TReticle2DataSize) for p, (offset, quant) in enumerate(entries)
+                  if p not in released and quant)
+    starts = [start for start, _ in kept]
+    max_end = 0
+    ends = []
+    for _, end in kept:
+        max_end = max(max_end, end)
+        ends.append(max_end)
+
+    regions = set()
+    for offset, quant in (entries[p] for p in released):
+        start, end = offset, offset + quant * TReticle2DataSize
+        if start == end:
+            continue
+        i = bisect_left(starts, end)
+        # no kept region starts before the end of this one and reaches past its start
+        if i == 0 or ends[i - 1] <= start:
+            regions.add((start, end))
+
+    # overlapping released regions are merged
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = merged[-1][0], max(merged[-1][1], end)
+        else:
+            merged.append((start, end))
+    return [(start, end - start) for start, end in merged]
+
+
+def _patch(fp: IO[bytes], section: str, index: int, reticle: Optional[Reticle2]) -> None:
+    start = fp.tell()
+    head, read = _Compressor._reader(fp)
+    header, container_index = parse_head(head)
+    zooms = zoom_count(header.PXLId)
+    counts = section_counts(header)
+
+    if section not in SECTIONS:
+        raise ValueError("Unknown section {!r}".format(section))
+    if not (0 <= index < counts[section]):
+        raise ValueError("Reticle index {} is out of range of {!r} with {} reticles".format(
+            index, section, counts[section]))
+    if not isinstance(reticle, (Reticle2, type(None))):
+        raise TypeError("Value should be a type of Reticle2 or None")
+
+    entries = [entry for key in SECTIONS for subcon in container_index[key] for entry in subcon]
+    first = sum(counts[key] for key in SECTIONS[:SECTIONS.index(section)]) * zooms + index * zooms
+    if first == 0 and (reticle is None or reticle[0] is None):
+        raise ValueError("The first reticle of the file must have a frame at zoom 0")
+    last = first + zooms
+    # following entries repeating the last one of the reticle, or its data, are empty frames,
+    # they follow the new last entry
+    old_last = entries[last - 1]
+    old_rle = None
+    while last < len(entries):
+        if entries[last] != old_last:
+            if entries[last][1] != old_last[1]:
+                break
+            if old_rle is None:
+                old_rle = read(old_last[0], old_last[1] * TReticle2DataSize)
+            if read(entries[last][0], entries[last][1] * TReticle2DataSize) != old_rle:
+                break
+        last += 1
+    released = range(first, last)
+    if reticle is not None:
+        # frames can be views of a mapping of this file, their data is copied before free regions are overwritten
+        reticle = Reticle2(*(Reticle2Frame(bytes(frame.rle)) if frame is not None and isinstance(frame.rle, memoryview)
+                             else frame for frame in reticle))
+
+    fp.seek(0, os.SEEK_END)
+    end = max(fp.tell() - start, header.SizeOfAllDataPXL2)
+    compressor = _PatchCompressor(fp, start, end, _free_regions(entries, released))
+    if first:
+        previous = entries[first - 1]
+        compressor.indexes.append(previous)
+        compressor.last_digest = Reticle2Frame(read(previous[0], previous[1] * TReticle2DataSize)).digest
+    compressor._compress_reticle(reticle, zooms)
+    patched = compressor.indexes[-zooms:]
+    patched.extend(patched[-1:] * (last - first - zooms))
+
+    fp.seek(start + HEADER_FORMAT.size + first * INDEX_FORMAT.size)
+    fp.write(b''.join(INDEX_FORMAT.pack(*entry) for entry in patched))
+    if compressor.offset != header.SizeOfAllDataPXL2:
+        fp.seek(start)
+        fp.write(HEADER_FORMAT.pack(*header._replace(SizeOfAllDataPXL2=compressor.offset)))
+
+
+def rebuild(__path: Union[str, os.PathLike[str]], *, dedup: bool = False) -> None:
+    """Rebuilds the file with `dumps`, dropping data left unused by patches, the file is replaced atomically"""
+    path = Path(__path)
+    buffer = path.read_bytes()
+    try:
+        header = parse_header(buffer)
+    except (ValueError, TypeError) as e:
+        raise Reticle2EncodeError(str(e))
+    hold = header.HoldOffCount > 0
+    out = dumps(loads(buffer, load_hold=hold), header.PXLId, dump_hold=hold, dedup=dedup)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(out)
+    os.replace(tmp, path)
+
+
+def patch(__path: Union[str, os.PathLike[str]], section: str, index: int, reticle: Optional[Reticle2], *,
+          compact: bool = False) -> None:
+    """
+    Replaces reticle `index` of the section in the file, only its index entries, the new frame data
+    and SizeOfAllDataPXL2 are written. Data of the old frames that is not shared with other reticles
+    is reused when the new frames fit, otherwise it is left unused until the file is compacted with `rebuild`.
+    The result decodes the same as `dump` of the loaded container with the reticle replaced.
+    Frames of the reticle may be views of a `load_mmap` of the same file, they are copied before writing
+    """
+    with open(__path, 'r+b') as fp:
+        try:
+            _patch(fp, section, index, reticle)
+        except (ValueError, TypeError) as e:
+            raise Reticle2EncodeError(str(e))
+    if compact:
+        rebuild(__path)
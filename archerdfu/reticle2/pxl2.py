@@ -3,8 +3,12 @@
 from construct import Struct, Const, Int32ul, Int32sl, RawCopy, GreedyBytes, Computed, ConstructError
 from typing_extensions import Optional, IO
 
-from archerdfu.reticle2 import Reticle2ListContainer, Reticle2, Reticle2Frame, Reticle2DecodeError, Reticle2EncodeError
+from archerdfu.reticle2 import instrumentation
+from archerdfu.reticle2._layout import pack, LEGACY_HEADER_FORMAT
+from archerdfu.reticle2.decode import Reticle2DecodeError
+from archerdfu.reticle2.encode import Reticle2EncodeError
 from archerdfu.reticle2.pxl3 import _PXL3Compressor
+from archerdfu.reticle2.reticle2 import Reticle2ListContainer, Reticle2, Reticle2Frame
 from archerdfu.reticle2.typedefs import TReticle2Index, _zoom_slice
 
 PXL2ID = b'PXL2'
@@ -41,28 +45,25 @@ class _PXL2Compressor(_PXL3Compressor):
         self.__init__()
         index_len = len(__list) * PXL2_ZOOM_COUNT
         index_size = index_len * TReticle2Index.sizeof()
-        self.offset = TPXL2HeaderSize + index_size
-        data_size = self._compress_reticle_list(__list, len(__list), PXL2_ZOOM_COUNT)
-        indexes = [self.indexes[i:i + PXL2_ZOOM_COUNT] for i in range(0, index_len, PXL2_ZOOM_COUNT)]
-        buffer = TPXL2Reticle.build({
-            'header': {
-                'ReticleCount': len(__list),
-                'SizeOfAllDataPXL2': TPXL2HeaderSize + index_size + data_size,
-            },
-            'index': indexes,
-            'data': {'value': self.buffer},
-        })
-
-        return buffer
+        self.base_offset = TPXL2HeaderSize + index_size
+        self.offset = self.base_offset
+        self._compress_reticle_list(__list, len(__list), PXL2_ZOOM_COUNT)
+
+        header = (PXL2ID, len(__list), self.offset)
+        return pack(LEGACY_HEADER_FORMAT, header, self.indexes, self.chunks)
 
     @staticmethod
     def decompress(__b: bytes) -> Reticle2ListContainer:
+        recorder = instrumentation.recorder
+        start = instrumentation.perf_counter() if recorder is not None else 0
         container = TPXL2Reticle.parse(__b)
+        if recorder is not None:
+            recorder.add_time('construct.parse', instrumentation.perf_counter() - start)
         index, rle = None, None
 
         reticles_list = Reticle2ListContainer()
         for i, subcon in enumerate(container.index):
-            reticle = Reticle2()
+            reticle = [None] * 8
             for z, zoom in enumerate(subcon):
                 _index = zoom
                 if _index != index:
@@ -71,7 +72,7 @@ class _PXL2Compressor(_PXL3Compressor):
                         reticle[z] = Reticle2Frame(_rle)
                         rle = _rle
                     index = _index
-            reticles_list.append(reticle)
+            reticles_list.append(Reticle2._trusted(reticle))
         return reticles_list
 
 
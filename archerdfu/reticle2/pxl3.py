@@ -4,7 +4,11 @@ from construct import Struct, Const, Default, Int32sl, Int32ul, RawCopy, GreedyB
     ConstructError
 from typing_extensions import Optional, IO
 
-from archerdfu.reticle2 import Reticle2Frame, Reticle2, Reticle2ListContainer, Reticle2DecodeError, Reticle2EncodeError
+from archerdfu.reticle2 import instrumentation
+from archerdfu.reticle2._layout import pack, LEGACY_HEADER_FORMAT
+from archerdfu.reticle2.decode import Reticle2DecodeError
+from archerdfu.reticle2.encode import Reticle2EncodeError
+from archerdfu.reticle2.reticle2 import _Compressor, Reticle2Frame, Reticle2, Reticle2ListContainer
 from archerdfu.reticle2.typedefs import TReticle2Index, _zoom_slice
 
 PXL3ID = b'PXL3'
@@ -36,68 +40,32 @@ TPXL3Reticle = Struct(
 )
 
 
-class _PXL3Compressor:
-    def __init__(self):
-        self.indexes = []
-        self.base_offset = 0
-        self.offset = 0
-        self.last_hash = None
-        self.buffer = bytearray()
-
-    def _compress_reticle_list(self, __list: Optional[Reticle2ListContainer], reticle_count, zoom_count) -> int:
-        start_buf_len = len(self.buffer)
-
-        if not __list:
-            self.indexes.extend([self.indexes[-1]] * reticle_count * zoom_count)
-            return 0
-
-        for i in range(reticle_count):
-            for z in range(zoom_count):
-
-                try:
-                    zoom = __list[i][z]
-                    if zoom is None or hash(zoom) == self.last_hash:
-                        raise IndexError("Empty or non-unique")
-                except IndexError:
-                    # writing previous index
-                    self.indexes.append(self.indexes[-1])
-                else:
-                    # writing new zoom data
-                    self.buffer += zoom.rle
-                    self.indexes.append({'offset': self.offset, 'quant': len(zoom) // 4})
-                    self.offset = self.base_offset + len(self.buffer)
-                    self.last_hash = hash(zoom)
-
-        return len(self.buffer) - start_buf_len
+class _PXL3Compressor(_Compressor):
 
     def compress(self, __list: Optional[Reticle2ListContainer]):
         self.__init__()
         index_len = len(__list) * PXL3_ZOOM_COUNT
         index_size = index_len * TReticle2Index.sizeof()
 
-        self.offset = TPXL3HeaderSize + index_size
-        data_size = self._compress_reticle_list(__list, len(__list), PXL3_ZOOM_COUNT)
+        self.base_offset = TPXL3HeaderSize + index_size
+        self.offset = self.base_offset
+        self._compress_reticle_list(__list, len(__list), PXL3_ZOOM_COUNT)
 
-        indexes = [self.indexes[i:i + PXL3_ZOOM_COUNT] for i in range(0, index_len, PXL3_ZOOM_COUNT)]
-        buffer = TPXL3Reticle.build({
-            'header': {
-                'ReticleCount': len(__list),
-                'SizeOfAllDataPXL2': TPXL3HeaderSize + index_size + data_size,
-            },
-            'index': indexes,
-            'data': {'value': self.buffer},
-        })
-
-        return buffer
+        header = (PXL3ID, len(__list), self.offset)
+        return pack(LEGACY_HEADER_FORMAT, header, self.indexes, self.chunks)
 
     @staticmethod
     def decompress(__b: bytes) -> Reticle2ListContainer:
+        recorder = instrumentation.recorder
+        start = instrumentation.perf_counter() if recorder is not None else 0
         container = TPXL3Reticle.parse(__b)
+        if recorder is not None:
+            recorder.add_time('construct.parse', instrumentation.perf_counter() - start)
         index, rle = None, None
 
         reticles_list = Reticle2ListContainer()
         for i, subcon in enumerate(container.index):
-            reticle = Reticle2()
+            reticle = [None] * 8
             for z, zoom in enumerate(subcon):
                 _index = zoom
                 if _index != index:
@@ -106,7 +74,7 @@ class _PXL3Compressor:
                         reticle[z] = Reticle2Frame(_rle)
                         rle = _rle
                     index = _index
-            reticles_list.append(reticle)
+            reticles_list.append(Reticle2._trusted(reticle))
         return reticles_list
 
 
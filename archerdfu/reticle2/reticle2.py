@@ -1,55 +1,128 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from hashlib import blake2b
 from os import PathLike
 
 from PIL import Image
-from typing_extensions import Union, IO, Any, Optional, Literal
+from typing_extensions import Union, IO, Any, Optional, Literal, Iterable, Iterator, Callable
 
-from archerdfu.reticle2 import rle
+from archerdfu.reticle2 import framecache, instrumentation, rle
 from archerdfu.reticle2._containers import FixedSizeList, RestrictedDict
-from archerdfu.reticle2.typedefs import (Reticle2Type, PXL4ID, PXL8ID, PXL4_ZOOM_COUNT, PXL8_ZOOM_COUNT,
-                                         SMALL_RETICLES_COUNT, HOLD_RETICLES_COUNT,
-                                         TReticle2FileHeaderSize, TReticle2Index, TReticle2Build, TReticle2Parse)
+from archerdfu.reticle2._layout import (parse_head, parse_header, head_size, pack, zoom_count, Reticle2Header,
+                                        TBuffer, HEADER_FORMAT, SECTIONS)
+from archerdfu.reticle2.runtable import RunTable
+from archerdfu.reticle2.typedefs import (Reticle2Type, PXL4ID, SMALL_RETICLES_COUNT, HOLD_RETICLES_COUNT,
+                                         TReticle2FileHeaderSize, TReticle2IndexSize, TReticle2DataSize)
 
+TWorkers = Union[int, Executor, None]
 
-@dataclass(unsafe_hash=True)
-class Reticle2Frame:
-    _rle: bytes = field(init=False, default=b'', compare=True, repr=False)
-    _img: Optional[Image.Image] = field(init=False, default=None, compare=False)
 
-    def __init__(self, __o: Union[bytes, Image.Image, None] = None):
+@dataclass(eq=False)
+class Reticle2Frame:
+    # None while an image set through img is not encoded yet
+    _rle: Optional[bytes] = field(init=False, default=b'', repr=False)
+    _img: Optional[Image.Image] = field(init=False, default=None)
+    _digest: Optional[bytes] = field(init=False, default=None, repr=False)
+    _runs: Optional[RunTable] = field(init=False, default=None, repr=False)
+    # the image was set through img rather than decoded from the RLE
+    _source_img: bool = field(init=False, default=False, repr=False)
+
+    def __init__(self, __o: Union[bytes, memoryview, RunTable, Image.Image, None] = None):
         if __o is not None:
-            if isinstance(__o, bytes):
+            if isinstance(__o, (bytes, memoryview)):
                 self.rle = __o
+            elif isinstance(__o, RunTable):
+                self.runs = __o
             elif isinstance(__o, Image.Image):
                 self.img = __o
             else:
-                raise TypeError('__o must be bytes or Image.Image')
+                raise TypeError('__o must be bytes, memoryview, RunTable or Image.Image')
 
     def __len__(self) -> int:
-        return len(self._rle)
+        return len(self.rle)
+
+    def __eq__(self, other):
+        if not isinstance(other, Reticle2Frame):
+            return NotImplemented
+        return self is other or (self.digest == other.digest and self.rle == other.rle)
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __reduce__(self):
+        # memoryview slices of a buffer or mmap can't be pickled, a set image is kept, a decoded one and the runs
+        # are rebuilt on use
+        return _restore_frame, (None if self._rle is None else bytes(self._rle),
+                                self._img if self._source_img else None)
+
+    @property
+    def digest(self) -> bytes:
+        """blake2b digest of the RLE, computed on first use and kept until the RLE changes"""
+        if self._digest is None:
+            self._digest = blake2b(self.rle, digest_size=16).digest()
+        return self._digest
 
     @property
-    def rle(self) -> bytes:
+    def rle(self) -> Union[bytes, memoryview]:
+        if self._rle is None:
+            _, self._rle = rle.encode(self._img)
         return self._rle
 
+    @property
+    def runs(self) -> RunTable:
+        if self._runs is None:
+            self._runs = RunTable.from_rle(self.rle)
+        return self._runs
+
     @property
     def img(self) -> Image.Image:
+        """An image set to the frame is loaded and copied, then encoded on first use of the RLE"""
+        if self._img is None:
+            self._img = rle.decode(self._rle, digest=self.digest if framecache.active is not None else None)
         return self._img
 
     @rle.setter
-    def rle(self, buffer: bytes):
+    def rle(self, buffer: Union[bytes, memoryview]):
+        if not isinstance(buffer, (bytes, memoryview)):
+            raise TypeError("RLE must be bytes or memoryview")
         self._rle = buffer
-        self._img = rle.decode(buffer)
+        self._img = None
+        self._digest = None
+        self._runs = None
+        self._source_img = False
+
+    @runs.setter
+    def runs(self, runs: RunTable):
+        self.rle = runs.to_rle()
+        self._runs = runs
 
     @img.setter
     def img(self, img: Image.Image):
-        self._img = img
-        self._rle = rle.encode(img)
+        img.load()
+        self._rle = None
+        self._img = img.copy()
+        self._digest = None
+        self._runs = None
+        self._source_img = True
+
+    def release(self) -> None:
+        """Drops the cached image and run table, next access decodes them again from the RLE"""
+        if self._rle is None:
+            # a pending image is encoded before it is dropped
+            _, self._rle = rle.encode(self._img)
+        self._img = None
+        self._runs = None
+        self._source_img = False
 
     def save(self, fp: str | bytes | PathLike[str] | PathLike[bytes] | IO[bytes],
              format: str | None = None,
              **params: Any) -> None:
-        self._img.save(fp, format, **params)
+        img = self.img
+        recorder = instrumentation.recorder
+        start = instrumentation.perf_counter() if recorder is not None else 0
+        img.save(fp, format, **params)
+        if recorder is not None:
+            recorder.add_time('image.save', instrumentation.perf_counter() - start)
 
     def open(self, fp: str | bytes | PathLike[str] | PathLike[bytes] | IO[bytes],
              mode: Literal["r"] = "r",
@@ -57,8 +130,15 @@ class Reticle2Frame:
         self.img = Image.open(fp, mode, formats)
 
 
+def _restore_frame(buffer: Optional[bytes], img: Optional[Image.Image]) -> Reticle2Frame:
+    frame = Reticle2Frame()
+    frame._rle, frame._img, frame._source_img = buffer, img, img is not None
+    return frame
+
+
 class Reticle2(FixedSizeList):
-    value_type = Optional[Reticle2Frame]
+    __slots__ = ()
+    value_type = (Reticle2Frame, type(None))
 
     def __init__(self, *frames):
         if not all(isinstance(f, self.value_type) for f in frames):
@@ -82,13 +162,21 @@ class Reticle2(FixedSizeList):
 
 
 class Reticle2ListContainer(list):
-    value_type = Optional[Reticle2]
+    __slots__ = ()
+    value_type = (Reticle2, type(None))
 
     def __init__(self, *reticles):
         if not all(isinstance(r, self.value_type) for r in reticles):
             raise TypeError("Value should be a type of Reticle2 or None")
         super().__init__(reticles)
 
+    @classmethod
+    def _trusted(cls, reticles: Iterable[Optional[Reticle2]]) -> 'Reticle2ListContainer':
+        """Builds the list from reticles known to be valid, skipping the checks"""
+        obj = list.__new__(cls)
+        list.extend(obj, reticles)
+        return obj
+
     def __setitem__(self, index, value):
         if not isinstance(value, self.value_type):
             raise TypeError("Value should be a type of Reticle2 or None")
@@ -100,19 +188,74 @@ class Reticle2ListContainer(list):
 
 class Reticle2Container(RestrictedDict):
     allowed_keys = {'small', 'hold', 'base', 'lrf'}
-    value_type = Optional[Reticle2ListContainer]
+    value_type = (Reticle2ListContainer, type(None))
 
     small: Reticle2ListContainer
     hold: Reticle2ListContainer
     base: Reticle2ListContainer
     lrf: Reticle2ListContainer
 
-    def encode(self, __type: Reticle2Type = PXL4ID, *, encode_hold=False) -> bytes:
-        return _Compressor().compress(self, __type, compress_hold=encode_hold)
+    def _frames(self, keys: Iterable[str]) -> list[Reticle2Frame]:
+        """Distinct frame objects of the sections in file order"""
+        frames = {}
+        for key in keys:
+            for reticle in getattr(self, key) or ():
+                for frame in reticle or ():
+                    if frame is not None:
+                        frames.setdefault(id(frame), frame)
+        return list(frames.values())
+
+    def encode(self, __type: Reticle2Type = PXL4ID, *, encode_hold=False, dedup=False,
+               workers: TWorkers = None) -> bytes:
+        """
+        workers - images set to frames and not encoded yet are encoded on a pool of that many threads,
+                  or on the given executor, before the file is built
+        """
+        if workers is not None:
+            keys = ('small', 'hold', 'base', 'lrf') if encode_hold else ('small', 'base', 'lrf')
+            pending = [frame for frame in self._frames(keys) if frame._rle is None]
+            for frame, buffer in zip(pending, _parallel_map(_encode_image, workers,
+                                                            [frame._img for frame in pending])):
+                frame._rle = buffer
+        return _Compressor().compress(self, __type, compress_hold=encode_hold, dedup=dedup)
 
     @staticmethod
-    def decode(__b: bytes, *, decode_hold: bool = False) -> 'Reticle2Container':
-        return _Compressor.decompress(__b, decompress_hold=decode_hold)
+    def decode(__b: Union[bytes, memoryview], *, decode_hold: bool = False,
+               sections: Optional[Iterable[str]] = None,
+               reticles: Optional[Iterable[int]] = None,
+               zooms: Optional[Iterable[int]] = None,
+               workers: TWorkers = None) -> 'Reticle2Container':
+        """
+        workers - images of the decoded frames are decoded up front on a pool of that many threads,
+                  or on the given executor, instead of on first access
+        """
+        container = _Compressor.decompress(__b, decompress_hold=decode_hold,
+                                           sections=sections, reticles=reticles, zooms=zooms)
+        if workers is not None:
+            frames = container._frames(SECTIONS)
+            digests = [frame.digest if framecache.active is not None else None for frame in frames]
+            images = _parallel_map(_decode_image, workers, [bytes(frame.rle) for frame in frames], digests)
+            for frame, img in zip(frames, images):
+                frame._img = img
+        return container
+
+
+def _encode_image(img: Image.Image) -> bytes:
+    return rle.encode(img)[1]
+
+
+def _decode_image(buffer: bytes, digest: Optional[bytes]) -> Image.Image:
+    return rle.decode(buffer, digest=digest)
+
+
+def _parallel_map(func: Callable, workers: TWorkers, *iterables) -> list:
+    """Ordered map on the executor, or on a pool of `workers` threads, 1 maps in the calling thread"""
+    if isinstance(workers, Executor):
+        return list(workers.map(func, *iterables))
+    if workers is None or workers <= 1:
+        return list(map(func, *iterables))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, *iterables))
 
 
 class _Compressor:
@@ -120,124 +263,244 @@ class _Compressor:
         self.indexes = []
         self.base_offset = 0
         self.offset = 0
-        self.last_hash = None
-        self.buffer = bytearray()
+        self.last_digest = None
+        self.chunks = []
+        self.dedup = False
+        self.frames = {}
+
+    def _write(self, data: Union[bytes, memoryview]) -> None:
+        self.chunks.append(data)
+        self.offset += len(data)
+
+    def _store(self, frame: Reticle2Frame) -> tuple[int, int]:
+        """Writes new zoom data, returns its (offset, quant) index entry"""
+        entry = (self.offset, len(frame) // TReticle2DataSize)
+        self._write(frame.rle)
+        return entry
+
+    def _frame_key(self, frame: Reticle2Frame) -> Any:
+        """Key of the dedup table, frames are matched by content"""
+        return frame
+
+    def _compress_reticle(self, reticle: Optional[Reticle2], zoom_count) -> None:
+        recorder = instrumentation.recorder
+        for z in range(zoom_count):
+
+            try:
+                zoom = reticle[z] if reticle is not None else None
+                if zoom is None or zoom.digest == self.last_digest:
+                    raise IndexError("Empty or non-unique")
+            except IndexError:
+                # writing previous index, the first one is an empty frame at the start of the data
+                self.indexes.append(self.indexes[-1] if self.indexes else (self.offset, 0))
+                if recorder is not None:
+                    recorder.count('entries_repeated')
+            else:
+                key = self._frame_key(zoom) if self.dedup else None
+                entry = self.frames.get(key) if self.dedup else None
+                if entry is None:
+                    entry = self._store(zoom)
+                    if self.dedup:
+                        self.frames[key] = entry
+                    if recorder is not None:
+                        recorder.count('frames_written')
+                        recorder.count('bytes_written', len(zoom))
+                        if self.dedup:
+                            recorder.count('dedup_misses')
+                elif recorder is not None:
+                    recorder.count('dedup_hits')
+                self.indexes.append(entry)
+                self.last_digest = zoom.digest
 
     def _compress_reticle_list(self, __list: Optional[Reticle2ListContainer], reticle_count, zoom_count) -> int:
-        start_buf_len = len(self.buffer)
-
-        if not __list:
-            self.indexes.extend([self.indexes[-1]] * reticle_count * zoom_count)
-            return 0
+        start_offset = self.offset
+        __list = __list or ()
 
+        # missing reticles repeat the previous index
         for i in range(reticle_count):
-            for z in range(zoom_count):
-
-                try:
-                    zoom = __list[i][z]
-                    if zoom is None or hash(zoom) == self.last_hash:
-                        raise IndexError("Empty or non-unique")
-                except IndexError:
-                    # writing previous index
-                    self.indexes.append(self.indexes[-1])
-                else:
-                    # writing new zoom data
-                    self.buffer += zoom.rle
-                    self.indexes.append({'offset': self.offset, 'quant': len(zoom) // 4})
-                    self.offset = self.base_offset + len(self.buffer)
-                    self.last_hash = hash(zoom)
-
-        return len(self.buffer) - start_buf_len
-
-    def compress(self, __o: Reticle2Container, __type: Reticle2Type = PXL4ID, *, compress_hold=False):
-        self.__init__()
-
-        if __type == PXL4ID:
-            zoom_count = PXL4_ZOOM_COUNT
-        elif __type == PXL8ID:
-            zoom_count = PXL8_ZOOM_COUNT
-        else:
-            raise TypeError("Unsupported reticle2 type {!r}".format(__type))
+            self._compress_reticle(__list[i] if i < len(__list) else None, zoom_count)
 
-        header_size = TReticle2FileHeaderSize
-        small_reticles_count = SMALL_RETICLES_COUNT if __o.small else 0
-        hold_reticles_count = HOLD_RETICLES_COUNT if compress_hold else 0
-        base_reticles_count = len(__o.base) if __o.base else 0
-        lrf_reticles_count = len(__o.lrf) if __o.lrf else 0
-        reticles_count = small_reticles_count + hold_reticles_count + base_reticles_count + lrf_reticles_count
-        index_size = reticles_count * zoom_count * TReticle2Index.sizeof()
+        return self.offset - start_offset
 
-        self.base_offset = header_size + index_size
-        self.offset = self.base_offset
+    @staticmethod
+    def _header(__type: Reticle2Type, counts: dict[str, int], spans: dict[str, tuple[int, int]],
+                size: int) -> Reticle2Header:
+        """counts are the reticles per section, spans the (offset, size) of the section data"""
+        return Reticle2Header(
+            PXLId=__type,
+            ReticleCount=sum(counts.values()),
+            SizeOfAllDataPXL2=size,
+
+            SmallCount=SMALL_RETICLES_COUNT,
+            OffsetSmall=spans['small'][0],
+            SmallSize=spans['small'][1],
+
+            HoldOffCount=counts['hold'],
+            OffsetHoldOff=spans['hold'][0],
+            HoldOffSize=spans['hold'][1],
+            HoldOffCrc=0,
+
+            BaseCount=counts['base'],
+            OffsetBase=spans['base'][0],
+            BaseSize=spans['base'][1],
+
+            LrfCount=counts['lrf'],
+            OffsetLrf=spans['lrf'][0],
+            LrfSize=spans['lrf'][1],
+        )
 
-        small_offset = self.offset
-        small_size = self._compress_reticle_list(__o.small, small_reticles_count, zoom_count)
-        hold_offset = self.offset
-        if compress_hold:
-            hold_size = self._compress_reticle_list(__o.hold, hold_reticles_count, zoom_count)
-        else:
-            hold_size = 0
-        base_offset = self.offset
-        base_size = self._compress_reticle_list(__o.base, base_reticles_count, zoom_count)
-        lrf_offset = self.offset
-        lrf_size = self._compress_reticle_list(__o.lrf, lrf_reticles_count, zoom_count)
-
-        header = {
-            'PXLId': __type,
-            'ReticleCount': reticles_count,
-            'SizeOfAllDataPXL2': header_size + index_size + len(self.buffer),
-
-            'SmallCount': SMALL_RETICLES_COUNT,
-            'OffsetSmall': small_offset,
-            'SmallSize': small_size,
-
-            'HoldOffCount': hold_reticles_count,
-            'OffsetHoldOff': hold_offset,
-            'HoldOffSize': hold_size,
-            'HoldOffCrc': 0,
-
-            'BaseCount': base_reticles_count,
-            'OffsetBase': base_offset,
-            'BaseSize': base_size,
-
-            'LrfCount': lrf_reticles_count,
-            'OffsetLrf': lrf_offset,
-            'LrfSize': lrf_size,
+    def compress(self, __o: Reticle2Container, __type: Reticle2Type = PXL4ID, *, compress_hold=False, dedup=False):
+        """With dedup every distinct frame is stored once and later index entries point back to it"""
+        self.__init__()
+        self.dedup = dedup
+        zooms = zoom_count(__type)
+        recorder = instrumentation.recorder
+        start = instrumentation.perf_counter() if recorder is not None else 0
+
+        # the header always declares the small section, missing reticles are filled like in Reticle2Writer
+        counts = {
+            'small': SMALL_RETICLES_COUNT,
+            'hold': HOLD_RETICLES_COUNT if compress_hold else 0,
+            'base': len(__o.base) if __o.base else 0,
+            'lrf': len(__o.lrf) if __o.lrf else 0,
         }
+        index_size = sum(counts.values()) * zooms * TReticle2IndexSize
 
-        return TReticle2Build.build({
-            'header': header,
-            'index': self.indexes,
-            'data': self.buffer,
-        })
+        self.base_offset = TReticle2FileHeaderSize + index_size
+        self.offset = self.base_offset
 
-    @staticmethod
-    def decompress(__b: bytes, *, decompress_hold: bool = False) -> 'Reticle2Container':
-        container = TReticle2Parse.parse(__b)
+        spans = {}
+        for key in SECTIONS:
+            spans[key] = self.offset, self._compress_reticle_list(getattr(__o, key), counts[key], zooms)
 
-        index, rle = None, None
+        header = self._header(__type, counts, spans, self.offset)
+        if recorder is None:
+            return pack(HEADER_FORMAT, header, self.indexes, self.chunks)
 
-        reticle_container = Reticle2Container()
+        packed = instrumentation.perf_counter()
+        buffer = pack(HEADER_FORMAT, header, self.indexes, self.chunks)
+        end = instrumentation.perf_counter()
+        recorder.add_time('pack', end - packed)
+        recorder.add_time('compress', end - start)
+        return buffer
 
-        if decompress_hold:
+    @staticmethod
+    def _selection(decompress_hold: bool, sections: Optional[Iterable[str]],
+                   reticles: Optional[Iterable[int]], zooms: Optional[Iterable[int]]) -> tuple:
+        if sections is not None:
+            sections = set(sections)
+            if not sections.issubset(SECTIONS):
+                raise ValueError("Unknown sections {!r}".format(sorted(sections.difference(SECTIONS))))
+            keys = tuple(key for key in SECTIONS if key in sections)
+        elif decompress_hold:
             keys = ('small', 'hold', 'base', 'lrf')
         else:
             keys = ('small', 'base', 'lrf')
+        reticles = None if reticles is None else set(reticles)
+        zooms = None if zooms is None else set(zooms)
+        return keys, reticles, zooms
+
+    @staticmethod
+    def _reader(__src: Union[bytes, memoryview, IO[bytes]]) -> tuple[TBuffer, Callable[[int, int], TBuffer]]:
+        """Returns the header with the index and a read(offset, size) function of the source"""
+        if hasattr(__src, 'read'):
+            start = __src.tell()
+
+            def read(offset: int, size: int) -> bytes:
+                __src.seek(start + offset)
+                return __src.read(size)
+
+            return read(0, head_size(parse_header(read(0, HEADER_FORMAT.size)))), read
+
+        if not isinstance(__src, bytes):
+            # frames become zero-copy slices of the source buffer, read-only to keep them hashable
+            __src = memoryview(__src).toreadonly()
+
+        def read(offset: int, size: int) -> TBuffer:
+            return __src[offset:offset + size]
+
+        return __src, read
+
+    @staticmethod
+    def iter_decompress(__src: Union[bytes, memoryview, IO[bytes]], *, decompress_hold: bool = False,
+                        sections: Optional[Iterable[str]] = None,
+                        reticles: Optional[Iterable[int]] = None,
+                        zooms: Optional[Iterable[int]] = None) -> Iterator[tuple[str, int, int, Reticle2Frame]]:
+        """
+        Yields (section, reticle index, zoom, frame) of the selected frames in file order,
+        file objects are read frame by frame
+        """
+        keys, reticles, zooms = _Compressor._selection(decompress_hold, sections, reticles, zooms)
+        head, read = _Compressor._reader(__src)
+        _, container_index = parse_head(head)
+        return _Compressor._iter_frames(read, container_index, keys, reticles, zooms)
+
+    @staticmethod
+    def _iter_frames(read: Callable[[int, int], TBuffer], container_index: dict, keys: tuple[str, ...],
+                     reticles: Optional[set[int]],
+                     zooms: Optional[set[int]]) -> Iterator[tuple[str, int, int, Reticle2Frame]]:
+        """iter_decompress over an already parsed index and selection"""
+        recorder = instrumentation.recorder
+
+        def _read(entry):
+            offset, quant = entry
+            if recorder is None:
+                return read(offset, quant * TReticle2DataSize)
+            start = instrumentation.perf_counter()
+            data = read(offset, quant * TReticle2DataSize)
+            recorder.add_time('slice', instrumentation.perf_counter() - start)
+            recorder.count('bytes_read', len(data))
+            return data
+
+        # an entry same as the previous one, or pointing to the same data, is skipped
+        index = None
+        index_rle = None
 
         for key in keys:
-            reticles_list = Reticle2ListContainer()
-            for i, subcon in enumerate(container.index[key]):
-                reticle = Reticle2()
-                for z, zoom in enumerate(subcon):
-                    _index = zoom
-                    if _index != index:
-                        _rle = container.reticles[key][i][z]
-                        if _rle != rle:
-                            reticle[z] = Reticle2Frame(_rle)
-                            rle = _rle
-                        index = _index
-                reticles_list.append(reticle)
-            reticle_container[key] = reticles_list
+            for i, subcon in enumerate(container_index[key]):
+                if reticles is None or i in reticles:
+                    for z, zoom in enumerate(subcon):
+                        if zoom != index:
+                            if zooms is None or z in zooms:
+                                _rle = _read(zoom)
+                                if index is None or index[1] != zoom[1] or _rle != (index_rle or _read(index)):
+                                    if recorder is not None:
+                                        recorder.count('frames_decoded')
+                                    yield key, i, z, Reticle2Frame(_rle)
+                                index_rle = _rle
+                            else:
+                                index_rle = None
+                            index = zoom
+                elif subcon:
+                    index = subcon[-1]
+                    index_rle = None
+
+    @staticmethod
+    def decompress(__b: Union[bytes, memoryview], *, decompress_hold: bool = False,
+                   sections: Optional[Iterable[str]] = None,
+                   reticles: Optional[Iterable[int]] = None,
+                   zooms: Optional[Iterable[int]] = None) -> 'Reticle2Container':
+        """
+        Decodes only the frames selected by sections, reticle indices and zooms (all of them by default),
+        reticles that are not selected are left empty and sections that are not selected are left None
+        """
+        recorder = instrumentation.recorder
+        start = instrumentation.perf_counter() if recorder is not None else 0
+        keys, reticles, zooms = _Compressor._selection(decompress_hold, sections, reticles, zooms)
+        head, read = _Compressor._reader(__b)
+        _, container_index = parse_head(head)
+
+        # frames are collected into plain lists, the containers are built once from them without checks
+        slots = {key: [[None] * 8 for _ in container_index[key]] for key in keys}
+        for key, i, z, frame in _Compressor._iter_frames(read, container_index, keys, reticles, zooms):
+            slots[key][i][z] = frame
+
+        reticle_container = Reticle2Container()
+        for key, reticles_list in slots.items():
+            dict.__setitem__(reticle_container, key,
+                             Reticle2ListContainer._trusted(map(Reticle2._trusted, reticles_list)))
+        if recorder is not None:
+            recorder.add_time('decompress', instrumentation.perf_counter() - start)
         return reticle_container
 
 
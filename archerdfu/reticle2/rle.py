@@ -1,7 +1,10 @@
-from typing import Literal
+from typing import Literal, Optional
 
+import numpy as np
 from PIL import Image
 
+from archerdfu.reticle2 import framecache, instrumentation
+
 TByteorder = Literal["little", "big"]
 
 
@@ -42,50 +45,108 @@ def _adjust_img_size(img: Image.Image, size: tuple[int, int] | list[int] = (640,
     return cropped_img
 
 
+def pack_records(x, y, q) -> np.ndarray:
+    """Vectorized :func:`pack_record`, returns little-endian uint32 records"""
+    r = (np.asarray(x, np.int64) << 20) | (np.asarray(y, np.int64) << 10) | np.asarray(q, np.int64)
+    if r.size and (r.min() < 0 or r.max() > 0xFFFFFFFF):
+        raise OverflowError("int too big to convert")
+    return r.astype('<u4')
+
+
+def _find_runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (x, y, q) of the True runs in a 2d mask in row-major order"""
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    y, x = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    return x, y, end - x
+
+
 def encode(img: Image.Image, size: tuple[int, int] | list[int] = (640, 480), threshold: int = 127):
-    # Відкриваємо зображення
-    img = img.convert('RGB')  # Перетворюємо в RGB, якщо зображення має інший формат
+    recorder = instrumentation.recorder
+    start = instrumentation.perf_counter() if recorder is not None else 0
+    img = img.convert('RGB')
     img = _adjust_img_size(img, size)
 
-    width, height = img.size
-    pixels = img.load()
-
-    buffer = b''
-
-    for y in range(height):
-        x = 0
-        while x < width:
-            color = pixels[x, y]
-            intensity = sum(color) / 3  # Обчислюємо інтенсивність пікселя
-            if intensity <= threshold:
-                start_x = x  # Зберігаємо початкову позицію сегмента
-                count = 1
-                x += 1
-                while x < width:
-                    color = pixels[x, y]
-                    intensity = sum(color) / 3
-                    if intensity <= threshold:
-                        count += 1
-                        x += 1
-                    else:
-                        break
-                # Додаємо сегмент з початковою координатою start_x
-                buffer += pack_record(start_x, y, count)
-            else:
-                x += 1
+    # same intensity as sum(color) / 3 <= threshold, computed for the whole image at once
+    intensity = np.asarray(img).sum(axis=2, dtype=np.uint16) / 3
+    x, y, q = _find_runs(intensity <= threshold)
+    buffer = pack_records(x, y, q).tobytes()
 
+    if recorder is not None:
+        recorder.add_time('rle.encode', instrumentation.perf_counter() - start)
     return img.size, buffer
 
 
-def decode(buffer: bytes, size: tuple[int, int] | list[int] = (640, 480)) -> Image.Image:
+def unpack_records(buffer, *, byteorder: TByteorder = 'little') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized :func:`unpack_record` over a whole buffer, trailing partial record is ignored"""
+    dtype = '<u4' if byteorder == 'little' else '>u4'
+    r = np.frombuffer(buffer, dtype, len(buffer) // 4)
+    return (r >> 20) & 0xFFF, (r >> 10) & 0x3FF, r & 0x3FF
+
+
+def _run_pixels(buffer, size: tuple[int, int] | list[int]) -> np.ndarray:
+    """Flat raster indices of every pixel covered by the runs, clipped to the frame bounds"""
     width, height, *_ = size
-    img = Image.new('RGB', size, color='white')
-    pixels = img.load()
-    for n in range(0, len(buffer), 4):
-        x, y, count = unpack_record(buffer[n:n + 4])
-        for i in range(count):
-            if 0 <= x + i < width and 0 <= y < height:
-                pixels[x + i, y] = (0, 0, 0)  # Чорний піксель
+    x, y, q = unpack_records(buffer)
+    visible = (y < height) & (x < width)
+    x, y = x[visible].astype(np.intp), y[visible].astype(np.intp)
+    q = np.minimum(x + q[visible], width) - x
+
+    # expand every run to its pixels: a run start repeated q times plus the offset inside the run
+    starts = y * width + x
+    offsets = np.arange(q.sum(), dtype=np.intp) - np.repeat(np.cumsum(q) - q, q)
+    return np.repeat(starts, q) + offsets
+
+
+def rasterize(buffer, size: tuple[int, int] | list[int] = (640, 480)) -> np.ndarray:
+    """Paints all the runs into a (height, width) boolean mask, True is a black pixel"""
+    width, height, *_ = size
+    mask = np.zeros(width * height, np.bool_)
+    mask[_run_pixels(buffer, size)] = True
+    return mask.reshape(height, width)
+
+
+def _image(pixels: np.ndarray, size: tuple[int, int] | list[int], mode: Literal['1', 'L', 'RGB']) -> Image.Image:
+    """Image of the given mode from the flat 'L' pixels"""
+    width, height, *_ = size
+    img = Image.frombuffer('L', (width, height), pixels, 'raw', 'L', 0, 1)
+    if mode == '1':
+        img = img.convert(mode, dither=Image.Dither.NONE)
+    elif mode == 'RGB':
+        img = img.convert(mode)
+    return img
+
+
+def decode(buffer: bytes, size: tuple[int, int] | list[int] = (640, 480),
+           mode: Literal['1', 'L', 'RGB'] = 'RGB', *, digest: Optional[bytes] = None) -> Image.Image:
+    """digest of the buffer, if known, saves hashing it for the frame cache key"""
+    if mode not in ('1', 'L', 'RGB'):
+        raise ValueError("Unsupported image mode {!r}".format(mode))
+    recorder = instrumentation.recorder
+    start = instrumentation.perf_counter() if recorder is not None else 0
+    width, height, *_ = size
+
+    cache = framecache.active
+    mask = None
+    if cache is not None:
+        key = cache.key(buffer, size, digest)
+        mask = cache.load(key, size)
+        if recorder is not None:
+            recorder.count('frame_cache_misses' if mask is None else 'frame_cache_hits')
+
+    if mask is not None:
+        pixels = (~mask.ravel()).view(np.uint8) * np.uint8(255)
+    else:
+        pixels = np.full(width * height, 255, np.uint8)
+        pixels[_run_pixels(buffer, size)] = 0
+        if cache is not None:
+            cache.store(key, pixels == 0)
+    img = _image(pixels, size, mode)
+    if recorder is not None:
+        recorder.add_time('rle.decode', instrumentation.perf_counter() - start)
     return img
 
 # if __name__ == '__main__':
@@ -0,0 +1,199 @@
+"""array backed representation of the frame runs"""
+
+import numpy as np
+from typing_extensions import Union, Optional
+
+from archerdfu.reticle2 import rle
+
+__all__ = ('RunTable',)
+
+TSize = Union[tuple[int, int], list[int]]
+
+# runs are linearized as y * _STRIDE + x, a stride wider than any row keeps rows apart
+_STRIDE = 1 << 12
+
+
+class RunTable:
+    """
+    Runs of a frame stored as an array of packed little-endian uint32 records `x << 20 | y << 10 | q`,
+    the same layout as the RLE buffer, so conversion in both directions does not copy the data
+    """
+    __slots__ = ('_records',)
+
+    def __init__(self, records: Optional[np.ndarray] = None):
+        if records is None:
+            records = np.empty(0, '<u4')
+        elif records.dtype != np.dtype('<u4') or records.ndim != 1:
+            raise TypeError("records must be a 1d array of little-endian uint32")
+        self._records = records
+
+    @classmethod
+    def from_rle(cls, buffer: Union[bytes, memoryview]) -> 'RunTable':
+        return cls(np.frombuffer(buffer, '<u4', len(buffer) // 4))
+
+    @classmethod
+    def from_arrays(cls, x, y, q) -> 'RunTable':
+        return cls(rle.pack_records(x, y, q))
+
+    def to_rle(self) -> memoryview:
+        """Read-only byte view of the records"""
+        return memoryview(np.ascontiguousarray(self._records)).cast('B').toreadonly()
+
+    @property
+    def records(self) -> np.ndarray:
+        return self._records
+
+    @property
+    def x(self) -> np.ndarray:
+        return (self._records >> 20) & 0xFFF
+
+    @property
+    def y(self) -> np.ndarray:
+        return (self._records >> 10) & 0x3FF
+
+    @property
+    def q(self) -> np.ndarray:
+        return self._records & 0x3FF
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __eq__(self, other):
+        if not isinstance(other, RunTable):
+            return NotImplemented
+        return np.array_equal(self._records, other._records)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(runs={len(self)}, pixels={self.pixel_count()}, bbox={self.bbox()})>"
+
+    def pixel_count(self) -> int:
+        return int(self.q.sum())
+
+    def bbox(self) -> Optional[tuple[int, int, int, int]]:
+        """Bounding box (left, top, right, bottom) of the runs like Image.getbbox, None if there are no pixels"""
+        q = self.q
+        visible = q > 0
+        if not visible.any():
+            return None
+        x, y, q = self.x[visible], self.y[visible], q[visible]
+        return int(x.min()), int(y.min()), int((x + q).max()), int(y.max()) + 1
+
+    def __or__(self, other: 'RunTable') -> 'RunTable':
+        return self.union(other)
+
+    def __and__(self, other: 'RunTable') -> 'RunTable':
+        return self.intersect(other)
+
+    def __sub__(self, other: 'RunTable') -> 'RunTable':
+        return self.subtract(other)
+
+    def __xor__(self, other: 'RunTable') -> 'RunTable':
+        return self.symmetric_difference(other)
+
+    def row(self, y: int) -> 'RunTable':
+        return RunTable(self._records[self.y == y])
+
+    def clip(self, size: TSize = (640, 480)) -> 'RunTable':
+        """Cuts the runs to the frame bounds dropping the empty ones"""
+        return self._clipped(self.x.astype(np.int64), self.y.astype(np.int64), self.q.astype(np.int64), size)
+
+    def translate(self, dx: int, dy: int, size: TSize = (640, 480)) -> 'RunTable':
+        """Shifts the runs, the result is clipped to the frame bounds"""
+        x = self.x.astype(np.int64) + dx
+        y = self.y.astype(np.int64) + dy
+        return self._clipped(x, y, self.q.astype(np.int64), size)
+
+    def flip_horizontal(self, size: TSize = (640, 480)) -> 'RunTable':
+        """Mirrors the frame left to right like Image.transpose(FLIP_LEFT_RIGHT), runs of a row are put back in order"""
+        width, *_ = size
+        x, q = self.x.astype(np.int64), self.q.astype(np.int64)
+        runs = self._clipped(width - x - q, self.y.astype(np.int64), q, size)
+        return RunTable(runs.records[np.lexsort((runs.x, runs.y))])
+
+    def flip_vertical(self, size: TSize = (640, 480)) -> 'RunTable':
+        """Mirrors the frame top to bottom like Image.transpose(FLIP_TOP_BOTTOM), rows are put back in order"""
+        _, height, *_ = size
+        runs = self._clipped(self.x.astype(np.int64), height - 1 - self.y.astype(np.int64),
+                             self.q.astype(np.int64), size)
+        return RunTable(runs.records[np.argsort(runs.y, kind='stable')])
+
+    def scale(self, factor: int, origin: tuple[int, int] = (320, 240), size: TSize = (640, 480)) -> 'RunTable':
+        """Integer upscaling of the visible pixels around the origin, every pixel becomes a factor x factor block"""
+        if factor < 1:
+            raise ValueError("factor must be a positive integer")
+        ox, oy = origin
+        runs = self.clip(size)
+        x, y, q = runs.x.astype(np.int64), runs.y.astype(np.int64), runs.q.astype(np.int64)
+        x = ox + (x - ox) * factor
+        y = oy + (y - oy) * factor
+        rows = np.arange(factor)
+        return self._clipped(
+            np.repeat(x, factor),
+            (y[:, None] + rows).ravel(),
+            np.repeat(q * factor, factor),
+            size
+        ).normalize(size)
+
+    def downscale(self, factor: int, origin: tuple[int, int] = (320, 240), size: TSize = (640, 480)) -> 'RunTable':
+        """
+        Integer downscaling of the visible pixels around the origin,
+        a pixel is set if any pixel of its factor x factor block is set
+        """
+        if factor < 1:
+            raise ValueError("factor must be a positive integer")
+        ox, oy = origin
+        runs = self.clip(size)
+        x, y, q = runs.x.astype(np.int64), runs.y.astype(np.int64), runs.q.astype(np.int64)
+        start = ox + (x - ox) // factor
+        end = ox + (x + q - 1 - ox) // factor + 1
+        return self._clipped(start, oy + (y - oy) // factor, end - start, size).normalize(size)
+
+    @classmethod
+    def _clipped(cls, x: np.ndarray, y: np.ndarray, q: np.ndarray, size: TSize) -> 'RunTable':
+        width, height, *_ = size
+        start = np.maximum(x, 0)
+        end = np.minimum(x + q, width)
+        visible = (y >= 0) & (y < height) & (end > start)
+        return cls.from_arrays(start[visible], y[visible], (end - start)[visible])
+
+    def _intervals(self, size: TSize) -> tuple[np.ndarray, np.ndarray]:
+        runs = self.clip(size)
+        start = runs.y.astype(np.int64) * _STRIDE + runs.x
+        return start, start + runs.q
+
+    def _combine(self, other: 'RunTable', op, size: TSize) -> 'RunTable':
+        """
+        Merges the runs of both tables as sorted boundary events and keeps the spans where
+        op(covered by self, covered by other) is true, the result is canonical
+        """
+        a_start, a_end = self._intervals(size)
+        b_start, b_end = other._intervals(size)
+        positions, inverse = np.unique(np.concatenate((a_start, a_end, b_start, b_end)), return_inverse=True)
+
+        a_delta = np.zeros(len(positions), np.int64)
+        b_delta = np.zeros(len(positions), np.int64)
+        np.add.at(a_delta, inverse[:len(a_start) * 2], np.repeat((1, -1), len(a_start)))
+        np.add.at(b_delta, inverse[len(a_start) * 2:], np.repeat((1, -1), len(b_start)))
+        inside = op(np.cumsum(a_delta) > 0, np.cumsum(b_delta) > 0)
+
+        # spans start where inside turns on and end where it turns off
+        edges = np.diff(inside.astype(np.int8), prepend=np.int8(0))
+        start = positions[edges == 1]
+        end = positions[edges == -1]
+        return RunTable.from_arrays(start % _STRIDE, start // _STRIDE, end - start)
+
+    def normalize(self, size: TSize = (640, 480)) -> 'RunTable':
+        """Clipped, sorted by rows, with overlapping and adjacent runs merged, the same as rle.encode output"""
+        return self._combine(RunTable(), np.logical_or, size)
+
+    def union(self, other: 'RunTable', size: TSize = (640, 480)) -> 'RunTable':
+        return self._combine(other, np.logical_or, size)
+
+    def intersect(self, other: 'RunTable', size: TSize = (640, 480)) -> 'RunTable':
+        return self._combine(other, np.logical_and, size)
+
+    def subtract(self, other: 'RunTable', size: TSize = (640, 480)) -> 'RunTable':
+        return self._combine(other, lambda a, b: a & ~b, size)
+
+    def symmetric_difference(self, other: 'RunTable', size: TSize = (640, 480)) -> 'RunTable':
+        return self._combine(other, np.logical_xor, size)
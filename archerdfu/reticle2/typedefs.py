@@ -96,6 +96,13 @@ TReticle2Parse = Struct(
     'reticles' / Computed(_reticles_slice),
 )
 
+# header and index only, frame data is sliced from the source buffer by the caller
+TReticle2ParseHead = Struct(
+    'header' / TReticle2FileHeader,
+    'index' / TReticle2IndexHeader,
+)
+
+
 TReticle2Build = Struct(
     'header' / TReticle2FileHeader,
     'index' / Switch(
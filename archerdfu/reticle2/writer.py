@@ -0,0 +1,108 @@
+"""streaming reticle2 writer, frame data goes to the file as reticles are added"""
+
+from typing_extensions import IO, Optional, Union
+
+from archerdfu.reticle2._layout import HEADER_FORMAT, INDEX_FORMAT, SECTIONS, pack, zoom_count
+from archerdfu.reticle2.reticle2 import _Compressor, Reticle2, Reticle2Frame
+from archerdfu.reticle2.typedefs import Reticle2Type, PXL4ID, SMALL_RETICLES_COUNT, HOLD_RETICLES_COUNT
+
+__all__ = ('Reticle2Writer',)
+
+
+class Reticle2Writer(_Compressor):
+    """
+    Writes a PXL4/PXL8 file reticle by reticle, the output is the same as `dump` of a container with these reticles.
+    Header and index space is reserved up front and patched on close, so only the index
+    and the reticle being added are held in memory. Sections are written in file order small, hold, base, lrf,
+    reticles that are not added are filled like the missing ones in `dump`.
+
+        with open('foo.pxl8', 'wb') as fp, Reticle2Writer(fp, PXL8ID, base=len(base)) as writer:
+            writer.add('small', small)
+            for reticle in base:
+                writer.add('base', reticle)
+    """
+
+    def __init__(self, __fp: IO[bytes], __type: Reticle2Type = PXL4ID, *,
+                 hold: bool = False, base: int = 0, lrf: int = 0, dedup: bool = False):
+        super().__init__()
+        if 'b' not in getattr(__fp, 'mode', ''):
+            raise TypeError("File must be opened in binary mode, e.g. use `open('foo.reticle2', 'wb')`") from None
+        if base < 0 or lrf < 0:
+            raise ValueError("Reticle counts must not be negative")
+
+        self.dedup = dedup
+        self._fp = __fp
+        self._type = __type
+        self._zooms = zoom_count(__type)
+        self._counts = {
+            'small': SMALL_RETICLES_COUNT,
+            'hold': HOLD_RETICLES_COUNT if hold else 0,
+            'base': base,
+            'lrf': lrf,
+        }
+        self._spans = {}
+        self._section = 0
+        self._added = 0
+        self._closed = False
+
+        self._start = __fp.tell()
+        self.base_offset = HEADER_FORMAT.size + sum(self._counts.values()) * self._zooms * INDEX_FORMAT.size
+        self.offset = self.base_offset
+        self._section_offset = self.offset
+        __fp.write(bytes(self.base_offset))
+
+    def _write(self, data: Union[bytes, memoryview]) -> None:
+        self._fp.write(data)
+        self.offset += len(data)
+
+    def _frame_key(self, frame: Reticle2Frame) -> bytes:
+        # only digests are kept, so written frames can be dropped by the caller
+        return frame.digest
+
+    def _finish(self, until: int) -> None:
+        """Fills and closes the sections before the position `until` in SECTIONS"""
+        while self._section < until:
+            key = SECTIONS[self._section]
+            for _ in range(self._counts[key] - self._added):
+                self._compress_reticle(None, self._zooms)
+            self._spans[key] = self._section_offset, self.offset - self._section_offset
+            self._section += 1
+            self._added = 0
+            self._section_offset = self.offset
+
+    def add(self, section: str, reticle: Optional[Reticle2]) -> None:
+        if self._closed:
+            raise ValueError("Writer is closed")
+        if section not in SECTIONS:
+            raise ValueError("Unknown section {!r}".format(section))
+        if not isinstance(reticle, (Reticle2, type(None))):
+            raise TypeError("Value should be a type of Reticle2 or None")
+
+        position = SECTIONS.index(section)
+        if position < self._section:
+            raise ValueError("Sections must be added in order {}, {!r} is already written".format(SECTIONS, section))
+        self._finish(position)
+        if self._added >= self._counts[section]:
+            raise ValueError("Section {!r} is full, {} reticles".format(section, self._counts[section]))
+
+        self._compress_reticle(reticle, self._zooms)
+        self._added += 1
+
+    def close(self) -> None:
+        """Writes the header and the index, the file position is left at the end of the data"""
+        if self._closed:
+            return
+        self._finish(len(SECTIONS))
+        header = self._header(self._type, self._counts, self._spans, self.offset)
+        self._fp.seek(self._start)
+        self._fp.write(pack(HEADER_FORMAT, header, self.indexes, ()))
+        self._fp.seek(self._start + self.offset)
+        self._closed = True
+
+    def __enter__(self) -> 'Reticle2Writer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # a failed write is left without the header
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,290 @@
+"""
+Benchmarks of decoding, encoding, RLE and hold-off generation
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --baseline results.json --threshold 1.25
+
+Every benchmark reports the best and the median time of a call over `--repeat` rounds,
+with a baseline the run fails if any benchmark is slower than baseline * threshold
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = ROOT / 'assets'
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from archerdfu.reticle2 import (loads, dumps, iter_frames, framecache, rle, pxl2, pxl3, mkhold, mksmall,  # noqa: E402
+                                set_mkhold_cache_size, Reticle2Container, Reticle2ListContainer, Reticle2,
+                                Reticle2Frame, Reticle2Writer, PXL4ID, PXL8ID)
+
+STRESS_RETICLES = 2000
+HOLD_DISTANCES = tuple(range(100, 1001, 50))
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registers a setup function returning the callable to time"""
+
+    def wrapper(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return wrapper
+
+
+def _read(name) -> bytes:
+    return (ASSETS_DIR / name).read_bytes()
+
+
+def _register_files():
+    for name in ('dump.pxl4', 'example.pxl4', 'example.pxl8'):
+        benchmark(f'loads[{name}]')(lambda name=name: (lambda b=_read(name): loads(b, load_hold=True)))
+        for pxl_type in (PXL4ID, PXL8ID):
+            benchmark(f'dumps[{name}->{pxl_type.decode().lower()}]')(
+                lambda name=name, pxl_type=pxl_type: (
+                    lambda c=loads(_read(name), load_hold=True): dumps(c, pxl_type, dump_hold=True)
+                )
+            )
+    for module, name in ((pxl3, 'wind.pxl3'), (pxl2, 'smallret.pxl2')):
+        benchmark(f'loads[{name}]')(lambda module=module, name=name: (lambda b=_read(name): module.loads(b)))
+        benchmark(f'dumps[{name}]')(
+            lambda module=module, name=name: (lambda c=module.loads(_read(name)): module.dumps(c))
+        )
+
+
+_register_files()
+
+
+@benchmark('rle.encode[sample1.bmp]')
+def _rle_encode():
+    img = Image.open(ASSETS_DIR / 'sample1.bmp')
+    img.load()
+    return lambda: rle.encode(img)
+
+
+@benchmark('rle.decode[sample1.bmp]')
+def _rle_decode():
+    _, buffer = rle.encode(Image.open(ASSETS_DIR / 'sample1.bmp'))
+    return lambda: rle.decode(buffer)
+
+
+@benchmark('rle.decode[sample1.bmp, 1]')
+def _rle_decode_bilevel():
+    _, buffer = rle.encode(Image.open(ASSETS_DIR / 'sample1.bmp'))
+    return lambda: rle.decode(buffer, mode='1')
+
+
+@benchmark('rle.decode[sample1.bmp, frame cache]')
+def _rle_decode_cached():
+    _, buffer = rle.encode(Image.open(ASSETS_DIR / 'sample1.bmp'))
+    directory = tempfile.TemporaryDirectory(prefix='reticle2-bench-')
+    cache = framecache.FrameCache(directory.name)
+
+    def run():
+        framecache.active = cache
+        try:
+            return rle.decode(buffer)
+        finally:
+            framecache.active = None
+
+    # the directory is removed once the benchmark is done with run, or at exit
+    run.directory = directory
+    return run
+
+
+@benchmark('mksmall')
+def _mksmall():
+    return mksmall
+
+
+@benchmark('mkhold[cold]')
+def _mkhold_cold():
+    def run():
+        set_mkhold_cache_size()
+        return mkhold(HOLD_DISTANCES, 100, 1420, 2)
+
+    return run
+
+
+@benchmark('mkhold[warm]')
+def _mkhold_warm():
+    set_mkhold_cache_size()
+    mkhold(HOLD_DISTANCES, 100, 1420, 2)
+    return lambda: mkhold(HOLD_DISTANCES, 100, 1420, 2)
+
+
+def stress_container(reticles: int = STRESS_RETICLES) -> Reticle2Container:
+    """A container with `reticles` base reticles of 8 shifted copies of a sample frame"""
+    runs = Reticle2Frame(Image.open(ASSETS_DIR / 'sample1.bmp')).runs
+    base = Reticle2ListContainer()
+    for i in range(reticles):
+        dx, dy = i % 64 - 32, i // 64 % 64 - 32
+        base.append(Reticle2(*(Reticle2Frame(runs.translate(dx + z, dy)) for z in range(8))))
+    return Reticle2Container(
+        small=Reticle2ListContainer(Reticle2(mksmall())),
+        base=base,
+    )
+
+
+_stress = {}
+
+
+def _stress_buffer() -> tuple[Reticle2Container, bytes]:
+    if not _stress:
+        container = stress_container()
+        _stress['container'] = container
+        _stress['buffer'] = dumps(container, PXL8ID)
+    return _stress['container'], _stress['buffer']
+
+
+@benchmark('stress.dumps[pxl8]')
+def _stress_dumps():
+    container, _ = _stress_buffer()
+    return lambda: dumps(container, PXL8ID)
+
+
+@benchmark('stress.dumps[pxl8, dedup]')
+def _stress_dumps_dedup():
+    container, _ = _stress_buffer()
+    return lambda: dumps(container, PXL8ID, dedup=True)
+
+
+@benchmark('stress.loads[pxl8]')
+def _stress_loads():
+    _, buffer = _stress_buffer()
+    return lambda: loads(buffer)
+
+
+@benchmark('stress.iter_frames[pxl8]')
+def _stress_iter_frames():
+    _, buffer = _stress_buffer()
+    return lambda: sum(1 for _ in iter_frames(buffer))
+
+
+@benchmark('stress.writer[pxl8]')
+def _stress_writer():
+    container, _ = _stress_buffer()
+
+    def run():
+        with open(os.devnull, 'wb') as fp, Reticle2Writer(fp, PXL8ID, base=len(container.base)) as writer:
+            writer.add('small', container.small[0])
+            for reticle in container.base:
+                writer.add('base', reticle)
+
+    return run
+
+
+@benchmark('stress.rasterize[pxl8]')
+def _stress_rasterize():
+    _, buffer = _stress_buffer()
+    frames = [frame for _, _, _, frame in iter_frames(buffer)][:200]
+    return lambda: [rle.rasterize(frame.rle) for frame in frames]
+
+
+def measure(func, repeat: int, min_time: float) -> dict:
+    """Calls func in loops long enough to last min_time, returns per call times"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+    return {'min': min(timings), 'median': statistics.median(timings), 'loops': loops, 'repeat': repeat}
+
+
+def run(pattern: str = '', repeat: int = 5, min_time: float = 0.1) -> dict:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if not re.search(pattern, name):
+            continue
+        results[name] = measure(setup(), repeat, min_time)
+        print(f"{name:<40} {_format_time(results[name]['min']):>10} {_format_time(results[name]['median']):>10}")
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'numpy': np.__version__,
+        },
+        'benchmarks': results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns names of the benchmarks slower than baseline * threshold"""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>10} {_format_time(current['min']):>10} {'new':>7}")
+            continue
+        ratio = current['min'] / previous['min']
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<40} {_format_time(previous['min']):>10} {_format_time(current['min']):>10} "
+              f"{ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="reticle2 benchmarks")
+    parser.add_argument('-k', dest='pattern', default='', help="run only benchmarks matching the regex")
+    parser.add_argument('-o', '--output', type=Path, help="write the results as json")
+    parser.add_argument('--baseline', type=Path, help="results json to compare with")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="slowdown ratio against the baseline counted as a regression")
+    parser.add_argument('--repeat', type=int, default=5, help="timed rounds per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.1, help="minimal duration of a round in seconds")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = _parser().parse_args(argv)
+    results = run(args.pattern, args.repeat, args.min_time)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
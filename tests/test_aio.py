@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from archerdfu.reticle2 import aio, loads, load_mmap, dumps, PXL8ID, Reticle2DecodeError, Reticle2Frame
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+@pytest.fixture
+def limited():
+    aio.configure(max_concurrency=2)
+    yield
+    aio.configure()
+
+
+def test_load_dump(tmp_path, limited) -> None:
+    src = ASSETS_DIR / 'dump.pxl4'
+    expected = loads(src.read_bytes(), load_hold=True)
+
+    async def main():
+        containers = await asyncio.gather(*(aio.load(src, load_hold=True) for _ in range(4)))
+        with open(src, 'rb') as fp:
+            containers.append(await aio.load(fp, load_hold=True))
+        await asyncio.gather(*(aio.dump(c, tmp_path / f'{i}.pxl8', PXL8ID, dump_hold=True)
+                               for i, c in enumerate(containers)))
+        return containers, await aio.dumps(containers[0], PXL8ID, dump_hold=True)
+
+    containers, buffer = asyncio.run(main())
+    assert all(c == expected for c in containers)
+    assert buffer == dumps(expected, PXL8ID, dump_hold=True)
+    assert all((tmp_path / f'{i}.pxl8').read_bytes() == buffer for i in range(len(containers)))
+
+
+def test_process_executor(tmp_path) -> None:
+    buffer = (ASSETS_DIR / 'example.pxl4').read_bytes()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        async def main():
+            container = await aio.loads(buffer, executor=executor)
+            await aio.save(container.base[0][0], tmp_path / 'frame.bmp', executor=executor)
+            return container, await aio.dumps(container, executor=executor)
+
+        container, out = asyncio.run(main())
+    assert container == loads(buffer)
+    assert out == dumps(loads(buffer))
+    assert (tmp_path / 'frame.bmp').read_bytes()[:2] == b'BM'
+
+
+def test_process_executor_mmap() -> None:
+    container = load_mmap(ASSETS_DIR / 'dump.pxl4', load_hold=True)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        out = asyncio.run(aio.dumps(container, PXL8ID, dump_hold=True, executor=executor))
+    assert out == dumps(container, PXL8ID, dump_hold=True)
+
+
+@pytest.mark.parametrize("process_pool", [False, True])
+def test_save_image(tmp_path, process_pool) -> None:
+    # gray levels are kept by the source image and lost in the RLE
+    img = Image.new('L', (640, 480), 200)
+    img.paste(100, (10, 10, 50, 50))
+    frame = Reticle2Frame(img)
+    frame.save(tmp_path / 'sync.png')
+    if process_pool:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            asyncio.run(aio.save(frame, tmp_path / 'async.png', executor=executor))
+    else:
+        asyncio.run(aio.save(frame, tmp_path / 'async.png'))
+    assert (tmp_path / 'async.png').read_bytes() == (tmp_path / 'sync.png').read_bytes()
+
+
+def test_errors(tmp_path) -> None:
+    with pytest.raises(Reticle2DecodeError):
+        asyncio.run(aio.loads(b'PXL4'))
+    frame = loads((ASSETS_DIR / 'example.pxl4').read_bytes()).base[0][0]
+    with pytest.raises(ValueError):
+        asyncio.run(aio.save(frame, tmp_path / 'frame'))
+    with pytest.raises(ValueError):
+        aio.configure(max_concurrency=0)
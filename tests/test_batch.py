@@ -0,0 +1,43 @@
+import shutil
+from pathlib import Path
+
+from archerdfu.reticle2 import loads, PXL8ID
+from archerdfu.reticle2.batch import batch, main
+from archerdfu.reticle2.pxl3 import loads as loads_pxl3
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+def _tree(tmp_path: Path) -> Path:
+    src = tmp_path / 'src'
+    (src / 'nested').mkdir(parents=True)
+    shutil.copy(ASSETS_DIR / 'example.pxl4', src)
+    shutil.copy(ASSETS_DIR / 'example.pxl8', src / 'nested')
+    shutil.copy(ASSETS_DIR / 'wind.pxl3', src / 'nested')
+    return src
+
+
+def test_batch_extract(tmp_path) -> None:
+    src = _tree(tmp_path)
+    stats = batch('extract', src, tmp_path / 'out', workers=2, image_format='png')
+    assert stats.files == 3 and not stats.errors
+    images = list((tmp_path / 'out').rglob('*.png'))
+    assert len(images) == stats.frames
+    assert (tmp_path / 'out' / 'nested' / 'wind.pxl3' / 'base_21_1.png').is_file()
+
+
+def test_batch_repack(tmp_path) -> None:
+    src = _tree(tmp_path)
+    stats = batch('repack', src, tmp_path / 'out', workers=2, pxl_type=PXL8ID)
+    assert stats.files == 1 and not stats.errors
+
+    expected = loads((src / 'example.pxl4').read_bytes())
+    assert loads((tmp_path / 'out' / 'example.pxl8').read_bytes()).base == expected.base
+
+
+def test_batch_legacy(tmp_path) -> None:
+    src = _tree(tmp_path)
+    assert main(['batch', 'legacy', str(src), str(tmp_path / 'out'), '-j', '1']) == 0
+
+    expected = loads_pxl3((src / 'nested' / 'wind.pxl3').read_bytes())
+    assert loads((tmp_path / 'out' / 'nested' / 'wind.pxl4').read_bytes()).base == expected
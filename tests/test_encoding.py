@@ -1,9 +1,14 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pytest
+from PIL import Image, ImageChops
 
-from archerdfu.reticle2 import (loads, dumps, load, Reticle2Container, Reticle2ListContainer,
-                                mksmall, Reticle2, mkhold, PXL4ID, dump, PXL8ID)
+from archerdfu.reticle2 import (loads, dumps, load, load_mmap, Reticle2Container, Reticle2ListContainer,
+                                mksmall, Reticle2, mkhold, PXL4ID, dump, PXL8ID, Reticle2Frame, Reticle2DecodeError,
+                                iter_frames, rle)
+from archerdfu.reticle2._layout import parse_head
 
 
 ASSETS_DIR = Path(__file__).parent.parent / 'assets'
@@ -100,3 +105,173 @@ def test_create_hold() -> None:
     )
     with open(ASSETS_DIR / "gen_hold.pxl4", "wb") as fp:
         dump(r, fp, PXL4ID, dump_hold=True)
+
+
+def test_lazy_frames() -> None:
+    with open(ASSETS_DIR / 'dump3.pxl4', "rb") as fp:
+        in_buf = fp.read()
+    r = loads(in_buf, load_hold=True)
+    assert dumps(r, dump_hold=True) == in_buf
+
+    frames = [f for reticles in r.values() for reticle in reticles for f in reticle if f is not None]
+    assert all(f._img is None for f in frames)
+
+    frame = frames[0]
+    assert frame.img is frame.img
+    frame.release()
+    assert frame._img is None
+
+
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_load_mmap(file_path) -> None:
+    with open(file_path, "rb") as fp:
+        in_buf = fp.read()
+    r = load_mmap(file_path, load_hold=True)
+    frames = [f for reticles in r.values() for reticle in reticles for f in reticle if f is not None]
+    assert all(isinstance(f.rle, memoryview) for f in frames)
+    assert r == loads(in_buf, load_hold=True)
+    assert dumps(r, dump_hold=True) == dumps(loads(in_buf, load_hold=True), dump_hold=True)
+
+
+def test_dumps_dedup() -> None:
+    rng = tuple(range(100, 1000, 100))
+    click = int(1.42 * 1000)
+    hold = Reticle2(*(mkhold(rng, 100, click, z) for z in range(1, 5)))
+    r = Reticle2Container(
+        small=Reticle2ListContainer(Reticle2(mksmall())),
+        base=Reticle2ListContainer(hold, Reticle2(mksmall()), hold),
+        lrf=Reticle2ListContainer(Reticle2(hold[2], hold[0])),
+    )
+
+    out_buf = dumps(r, dump_hold=True)
+    dedup_buf = dumps(r, dump_hold=True, dedup=True)
+    assert len(dedup_buf) < len(out_buf)
+    assert loads(dedup_buf) == loads(out_buf)
+
+    _, index = parse_head(dedup_buf)
+    entries = {entry for reticles in index.values() for reticle in reticles for entry in reticle}
+    frames = {f for reticles in r.values() if reticles for reticle in reticles for f in reticle if f is not None}
+    assert len(entries) == len(frames)
+
+
+def test_frame_digest() -> None:
+    small = mksmall()
+    frame = Reticle2Frame(memoryview(bytes(small.rle)))
+    assert frame == small and hash(frame) == hash(small)
+    assert frame.digest == small.digest
+    assert len({small, frame}) == 1
+
+    frame.rle = small.rle[:-4]
+    assert frame != small
+    assert frame.digest != small.digest
+    assert frame != small.rle
+
+
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_loads_selection(file_path) -> None:
+    with open(file_path, "rb") as fp:
+        in_buf = fp.read()
+    full = loads(in_buf, load_hold=True)
+
+    r = loads(in_buf, sections={'base'}, reticles=[1], zooms=[0, 2])
+    assert r.small is None and r.hold is None and r.lrf is None
+    assert len(r.base) == len(full.base)
+    for i, reticle in enumerate(r.base):
+        for z, frame in enumerate(reticle):
+            if i == 1 and z in (0, 2):
+                assert frame == full.base[i][z]
+            else:
+                assert frame is None
+
+    r = loads(in_buf, sections=('hold', 'small'))
+    assert r.hold == full.hold and r.small == full.small and r.base is None
+
+    with pytest.raises(Reticle2DecodeError):
+        loads(in_buf, sections=['unknown'])
+
+
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_iter_frames(file_path) -> None:
+    with open(file_path, "rb") as fp:
+        in_buf = fp.read()
+    full = loads(in_buf, load_hold=True)
+    expected = [(key, i, z, frame) for key in ('small', 'hold', 'base', 'lrf') for i, reticle in enumerate(full[key])
+                for z, frame in enumerate(reticle) if frame is not None]
+    assert list(iter_frames(in_buf, load_hold=True)) == expected
+
+    with open(file_path, "rb") as fp:
+        frames = iter_frames(fp, load_hold=True)
+        assert next(frames) == expected[0]
+        assert list(frames) == expected[1:]
+
+    selected = [item for item in expected if item[0] == 'base' and item[1] == 1 and item[2] in (0, 2)]
+    assert list(iter_frames(in_buf, sections={'base'}, reticles=[1], zooms=[0, 2])) == selected
+
+    with pytest.raises(Reticle2DecodeError):
+        next(iter_frames(in_buf[:10]))
+
+
+def _image_container(count: int = 6) -> Reticle2Container:
+    images = [Image.open(ASSETS_DIR / name).convert('RGB') for name in ('sample1.bmp', 'sample2.bmp')]
+    return Reticle2Container(
+        small=Reticle2ListContainer(Reticle2(mksmall())),
+        base=Reticle2ListContainer(*(
+            Reticle2(*(Reticle2Frame(ImageChops.offset(images[i % 2], i, z)) for z in range(4)))
+            for i in range(count)
+        )),
+    )
+
+
+def test_workers() -> None:
+    expected = dumps(_image_container(), PXL8ID)
+    assert dumps(_image_container(), PXL8ID, workers=4) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert dumps(_image_container(), PXL8ID, workers=executor) == expected
+
+    r = loads(expected, workers=4)
+    assert r == loads(expected)
+    frames = [frame for reticle in r.base for frame in reticle if frame is not None]
+    assert all(frame._img is not None for frame in frames)
+    assert [frame.img.tobytes() for frame in frames] == [Reticle2Frame(frame.rle).img.tobytes() for frame in frames]
+
+
+def test_deferred_image_encoding(tmp_path) -> None:
+    with Image.open(ASSETS_DIR / 'sample1.bmp') as img:
+        frame = Reticle2Frame(img)
+    assert frame._rle is None
+    assert len(frame) > 0 and frame.rle == Reticle2Frame(frame.runs).rle
+
+    # the frame keeps its own copy of the image
+    img = Image.open(ASSETS_DIR / 'sample1.bmp').convert('RGB')
+    frame = Reticle2Frame(img)
+    img.paste((255, 255, 255), (0, 0, *img.size))
+    assert frame.rle == rle.encode(Image.open(ASSETS_DIR / 'sample1.bmp'))[1]
+    with pytest.raises(TypeError):
+        frame.rle = None
+
+    frame = Reticle2Frame()
+    with open(ASSETS_DIR / 'sample1.bmp', 'rb') as fp:
+        frame.open(fp)
+    frame.release()
+    assert frame.rle and frame.img.size == (640, 480)
+
+
+def test_slotted_containers() -> None:
+    r = loads((ASSETS_DIR / 'example.pxl8').read_bytes())
+    reticle = r.base[0]
+    assert not hasattr(reticle, '__dict__') and not hasattr(r.base, '__dict__')
+    assert type(reticle) is Reticle2 and len(reticle) == 8 and type(r.base) is Reticle2ListContainer
+
+    with pytest.raises(TypeError):
+        reticle[0] = b''
+    with pytest.raises(IndexError):
+        reticle[8] = None
+    with pytest.raises(TypeError):
+        r.base[0] = reticle[0]
+    with pytest.raises(TypeError):
+        Reticle2(b'')
+    with pytest.raises(TypeError):
+        Reticle2ListContainer(reticle[0])
+
+    copy = pickle.loads(pickle.dumps(r))
+    assert copy == r and copy.base[0]._size == 8
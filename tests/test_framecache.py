@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from archerdfu.reticle2 import framecache, loads, rle
+from archerdfu.reticle2.framecache import FrameCache, STALE_TMP_AGE
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield framecache.enable(tmp_path / 'cache')
+    framecache.disable()
+
+
+def _frames():
+    container = loads((ASSETS_DIR / 'example.pxl8').read_bytes())
+    return [frame for reticles in container.values() if reticles
+            for reticle in reticles for frame in reticle if frame is not None]
+
+
+@pytest.mark.parametrize("mode", ['1', 'L', 'RGB'])
+def test_decode(cache, mode) -> None:
+    frames = _frames()
+    framecache.disable()
+    expected = [rle.decode(frame.rle, mode=mode).tobytes() for frame in frames]
+    assert cache.hits == cache.misses == 0
+    framecache.active = cache
+
+    unique = len({frame.digest for frame in frames})
+    assert [rle.decode(frame.rle, mode=mode).tobytes() for frame in frames] == expected
+    assert cache.hits == len(frames) - unique and cache.misses == unique
+    assert [rle.decode(frame.rle, mode=mode, digest=frame.digest).tobytes() for frame in frames] == expected
+    assert cache.hits == 2 * len(frames) - unique
+
+    # frame images and decoding with workers consult the cache too
+    hits = cache.hits
+    assert [frame.img.tobytes() for frame in _frames()] == [rle.decode(frame.rle).tobytes() for frame in frames]
+    assert cache.hits == hits + len(frames) * 2
+    loads((ASSETS_DIR / 'example.pxl8').read_bytes(), workers=2)
+    assert cache.hits == hits + len(frames) * 3
+
+
+def test_shared(cache) -> None:
+    frame = _frames()[1]
+    frame.img
+    other = FrameCache(cache.path)
+    mask = other.load(other.key(frame.rle, (640, 480)), (640, 480))
+    assert np.array_equal(mask, rle.rasterize(frame.rle))
+    assert other.load(other.key(frame.rle, (320, 240)), (320, 240)) is None
+
+
+def test_threads(cache) -> None:
+    frames = _frames()
+    threads = [threading.Thread(target=lambda: [rle.decode(frame.rle) for frame in frames]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.hits + cache.misses == 4 * len(frames)
+    # racing stores of a key count its size twice until eviction measures the directory
+    cache.evict()
+    assert cache._size == sum(f.stat().st_size for f in cache._entries())
+
+
+def test_evict(tmp_path) -> None:
+    frames = _frames()
+    cache = FrameCache(tmp_path, max_size=3 * 38400)
+    for i, frame in enumerate(frames[:6]):
+        cache.store(f'{i:02}', rle.rasterize(frame.rle))
+    files = list(cache._entries())
+    assert sum(f.stat().st_size for f in files) <= cache.max_size
+    assert cache.load('05', (640, 480)) is not None and cache.load('00', (640, 480)) is None
+
+    cache.clear()
+    assert not list(cache._entries())
+    with pytest.raises(ValueError):
+        FrameCache(tmp_path, max_size=0)
+
+
+def test_evict_foreign_files(tmp_path) -> None:
+    cache = FrameCache(tmp_path)
+    old = time.time() - 2 * STALE_TMP_AGE
+    foreign = [tmp_path / 'project' / 'notes.txt', tmp_path / 'ab' / 'notes.txt', tmp_path / 'ab' / 'x.tmp',
+               tmp_path / 'notes.bits']
+    stale = tmp_path / 'ab' / '.stale.tmp'
+    for file in (*foreign, stale):
+        file.parent.mkdir(exist_ok=True)
+        file.write_bytes(b'data')
+        os.utime(file, (old, old))
+
+    cache.store('ab', rle.rasterize(_frames()[0].rle))
+    cache.clear()
+    assert all(file.exists() for file in foreign)
+    assert not stale.exists()
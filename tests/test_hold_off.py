@@ -0,0 +1,41 @@
+import pytest
+
+from archerdfu.reticle2 import mkhold, mkhold_cache_info, set_mkhold_cache_size, rle
+from archerdfu.reticle2._hold_off import create_hold_reticle
+
+
+def _reference(distances, zero, click_micron, zoom=1, subsonic=False) -> bytes:
+    return b''.join(rle.pack_record(*i) for i in create_hold_reticle(distances, zero, click_micron, zoom,
+                                                                         subsonic=subsonic))
+
+
+@pytest.mark.parametrize("subsonic", [False, True])
+@pytest.mark.parametrize("zoom", [1, 2, 3, 4])
+@pytest.mark.parametrize("click_micron", [1000, 1420, 3600])
+@pytest.mark.parametrize("distances, zero", [
+    (tuple(range(100, 1000, 100)), 100),
+    (tuple(range(100, 1001, 50)), 300),
+    (tuple(range(25, 275, 25)), 150),
+    ((), 100),
+])
+def test_mkhold(distances, zero, click_micron, zoom, subsonic) -> None:
+    expected = _reference(distances, zero, click_micron, zoom, subsonic)
+    assert mkhold(distances, zero, click_micron, zoom, subsonic=subsonic).rle == expected
+
+
+def test_mkhold_cache() -> None:
+    distances = tuple(range(100, 1000, 100))
+    set_mkhold_cache_size(4)
+    try:
+        first = mkhold(distances, 100, 1420)
+        info = mkhold_cache_info()
+        assert info.maxsize == 4 and info.currsize == 4 and info.hits == 0
+        assert mkhold(distances[-4:], 100, 1420, 2).rle == _reference(distances[-4:], 100, 1420, 2)
+        assert mkhold_cache_info().hits == 4
+        assert mkhold(distances, 100, 1420).rle == first.rle
+
+        set_mkhold_cache_size(0)
+        mkhold(distances, 100, 1420)
+        assert mkhold_cache_info().currsize == 0
+    finally:
+        set_mkhold_cache_size()
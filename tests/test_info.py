@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from archerdfu.reticle2 import inspect, loads, Reticle2DecodeError, PXL4ID, PXL8ID
+from archerdfu.reticle2 import pxl2, pxl3
+from archerdfu.reticle2.typedefs import TReticle2ParseHead
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+@pytest.mark.parametrize("file_name", ['dump.pxl4', 'example.pxl4', 'example.pxl8', 'dump3.pxl8'])
+def test_inspect(file_name) -> None:
+    path = ASSETS_DIR / file_name
+    buffer = path.read_bytes()
+    info = inspect(path)
+    head = TReticle2ParseHead.parse(buffer)
+
+    assert info.pxl_id in (PXL4ID, PXL8ID) and info.header.PXLId == info.pxl_id
+    assert info.counts == {'small': head.header.SmallCount, 'hold': head.header.HoldOffCount,
+                           'base': head.header.BaseCount, 'lrf': head.header.LrfCount}
+    assert info.size == head.header.SizeOfAllDataPXL2
+    for key in info.index:
+        assert [[(e.offset, e.quant) for e in reticle] for reticle in head.index[key]] == \
+               [list(reticle) for reticle in info.index[key]]
+    assert info.data_size <= len(buffer)
+
+    with open(path, 'rb') as fp:
+        assert inspect(fp) == info
+    assert inspect(buffer) == info
+
+    frames = {frame.rle for reticles in loads(buffer, load_hold=True).values() if reticles
+              for reticle in reticles for frame in reticle if frame is not None}
+    assert len(frames) <= len(info.frames)
+    assert info.unique_offsets == len({offset for offset, quant in info.frames})
+    assert sum(map(len, frames)) <= info.data_size
+
+
+@pytest.mark.parametrize("module, file_name", [(pxl3, 'wind.pxl3'), (pxl2, 'smallret.pxl2')])
+def test_inspect_legacy(module, file_name) -> None:
+    buffer = (ASSETS_DIR / file_name).read_bytes()
+    info = inspect(ASSETS_DIR / file_name)
+    container = module.loads(buffer)
+    assert info.header is None and info.pxl_id == buffer[:4]
+    assert info.counts == {'base': len(container)}
+    assert all(len(reticle) == info.zoom_count for reticle in info.index['base'])
+    assert max(offset + quant * 4 for offset, quant in info.frames) == len(buffer)
+
+
+def test_inspect_errors() -> None:
+    buffer = (ASSETS_DIR / 'example.pxl4').read_bytes()
+    with pytest.raises(Reticle2DecodeError):
+        inspect(buffer[:70])
+    with pytest.raises(Reticle2DecodeError):
+        inspect(b'PXL9' + buffer[4:])
+    with pytest.raises(Reticle2DecodeError):
+        inspect((ASSETS_DIR / 'wind.pxl3').read_bytes()[:20])
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from archerdfu.reticle2 import instrumentation, loads, dumps, pxl3, Reticle2
+from archerdfu.reticle2._layout import parse_header, head_size
+from archerdfu.reticle2.instrumentation import Recorder, record
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+def test_disabled() -> None:
+    assert instrumentation.recorder is None
+    container = loads((ASSETS_DIR / 'example.pxl4').read_bytes(), workers=2)
+    dumps(container, dedup=True, workers=2)
+    pxl3.loads((ASSETS_DIR / 'wind.pxl3').read_bytes())
+    assert instrumentation.recorder is None
+
+    # nothing recorded while disabled shows up once recording starts
+    with record(Recorder()) as recorder:
+        pass
+    assert recorder.as_dict() == {'timings': {}, 'calls': {}, 'counters': {}, 'dedup_hit_rate': None}
+
+
+def test_record(tmp_path) -> None:
+    in_buf = (ASSETS_DIR / 'dump.pxl4').read_bytes()
+    with record() as recorder:
+        container = loads(in_buf, load_hold=True)
+        container.lrf.append(Reticle2(container.base[0][0]))
+        out_buf = dumps(container, dump_hold=True, dedup=True)
+        container.base[0][0].save(tmp_path / 'frame.bmp')
+        pxl3.loads((ASSETS_DIR / 'wind.pxl3').read_bytes())
+    assert instrumentation.recorder is None
+
+    frames = sum(frame is not None for reticles in container.values() if reticles
+                 for reticle in reticles for frame in reticle)
+    stats = recorder.as_dict()
+    assert set(stats['timings']) == {'parse_header', 'parse_index', 'slice', 'decompress', 'compress', 'pack',
+                                     'rle.decode', 'image.save', 'construct.parse'}
+    assert stats['calls']['decompress'] == 1 and stats['calls']['rle.decode'] == 1
+    assert stats['calls']['parse_header'] == 1 and stats['calls']['parse_index'] == 1
+    counters = stats['counters']
+    assert counters['frames_decoded'] == frames - 1
+    assert counters['dedup_hits'] == 1 and counters['dedup_misses'] == frames - 1
+    assert counters['frames_written'] == counters['dedup_misses']
+    assert counters['bytes_written'] == len(out_buf) - head_size(parse_header(out_buf))
+    assert recorder.dedup_hit_rate == 1 / frames
+
+    recorder.reset()
+    assert not recorder.timings and not recorder.counters
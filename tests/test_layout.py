@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from archerdfu.reticle2 import loads, PXL4ID, PXL8ID
+from archerdfu.reticle2._layout import parse_head, parse_header
+from archerdfu.reticle2.reticle2 import _Compressor
+from archerdfu.reticle2.typedefs import TReticle2ParseHead, TReticle2Build
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+TEST_FILES = [
+    ASSETS_DIR / 'dump.pxl4',
+    ASSETS_DIR / 'dump2.pxl4',
+    ASSETS_DIR / 'dump3.pxl8',
+    ASSETS_DIR / 'example.pxl4',
+    ASSETS_DIR / 'example.pxl8',
+    ASSETS_DIR / 'gen_hold.pxl4',
+]
+
+
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_parse_head(file_path) -> None:
+    with open(file_path, 'rb') as fp:
+        buf = fp.read()
+
+    expected = TReticle2ParseHead.parse(buf)
+    header, index = parse_head(buf)
+
+    assert header._asdict() == {k: v for k, v in expected.header.items() if not k.startswith('_')}
+    for key, reticles in index.items():
+        assert reticles == [tuple((z.offset, z.quant) for z in r) for r in expected.index[key]]
+
+    assert parse_head(memoryview(buf)) == (header, index)
+
+
+def test_parse_head_errors() -> None:
+    with open(ASSETS_DIR / 'example.pxl4', 'rb') as fp:
+        buf = fp.read()
+
+    with pytest.raises(TypeError):
+        parse_head(b'PXL5' + buf[4:])
+    with pytest.raises(ValueError):
+        parse_head(buf[:60])
+    with pytest.raises(ValueError):
+        parse_head(buf[:100])
+
+
+@pytest.mark.parametrize("pxl_id", [PXL4ID, PXL8ID])
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_pack(file_path, pxl_id) -> None:
+    with open(file_path, 'rb') as fp:
+        container = loads(fp.read(), load_hold=True)
+
+    compressor = _Compressor()
+    buf = compressor.compress(container, pxl_id, compress_hold=True)
+
+    assert buf == TReticle2Build.build({
+        'header': parse_header(buf)._asdict(),
+        'index': [{'offset': offset, 'quant': quant} for offset, quant in compressor.indexes],
+        'data': b''.join(compressor.chunks),
+    })
@@ -0,0 +1,94 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from archerdfu.reticle2 import loads, load_mmap, dumps, patch, rebuild, inspect, rle, Reticle2, Reticle2Frame, \
+    Reticle2ListContainer, Reticle2EncodeError, PXL8ID
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+def _expected(buffer: bytes, section: str, index: int, reticle) -> bytes:
+    container = loads(buffer, load_hold=True)
+    container[section][index] = reticle
+    return dumps(container, buffer[:4], dump_hold=True)
+
+
+def _shifted(reticle: Reticle2, dx: int) -> Reticle2:
+    return Reticle2(*(frame and Reticle2Frame(frame.runs.translate(dx, 0)) for frame in reticle))
+
+
+@pytest.mark.parametrize("file_name", ['dump3.pxl4', 'dump3.pxl8'])
+def test_patch(file_name, tmp_path) -> None:
+    path = tmp_path / file_name
+    shutil.copy(ASSETS_DIR / file_name, path)
+    original = path.read_bytes()
+    assert dumps(loads(original, load_hold=True), original[:4], dump_hold=True) == original
+    container = loads(original, load_hold=True)
+
+    cases = [
+        ('base', 1, _shifted(container.base[1], 5)),
+        ('base', 0, Reticle2(container.small[0][0])),
+        ('base', 2, Reticle2(*container.base[2][:2])),
+        ('lrf', 0, None),
+        ('base', len(container.base) - 1, container.base[0]),
+        ('hold', 3, _shifted(container.base[0], -3)),
+    ]
+    for section, index, reticle in cases:
+        before = path.read_bytes()
+        expected = loads(_expected(before, section, index, reticle), load_hold=True)
+        patch(path, section, index, reticle)
+        assert loads(path.read_bytes(), load_hold=True) == expected
+
+    size = len(path.read_bytes())
+    assert inspect(path).size == size
+
+    final = loads(path.read_bytes(), load_hold=True)
+    rebuild(path)
+    assert loads(path.read_bytes(), load_hold=True) == final
+    assert len(path.read_bytes()) <= size
+
+
+def test_patch_reuses_space(tmp_path) -> None:
+    path = tmp_path / 'dump3.pxl8'
+    shutil.copy(ASSETS_DIR / 'dump3.pxl8', path)
+    container = loads(path.read_bytes())
+    size = path.stat().st_size
+    patch(path, 'base', 1, Reticle2(*container.base[1][:1]))
+    assert path.stat().st_size == size
+    patch(path, 'base', 1, _shifted(container.base[1], 1), compact=True)
+    assert loads(path.read_bytes()).base[1] == _shifted(container.base[1], 1)
+
+
+def test_patch_errors(tmp_path) -> None:
+    path = tmp_path / 'dump3.pxl8'
+    shutil.copy(ASSETS_DIR / 'dump3.pxl8', path)
+    original = path.read_bytes()
+    with pytest.raises(Reticle2EncodeError):
+        patch(path, 'base', 100, None)
+    with pytest.raises(Reticle2EncodeError):
+        patch(path, 'frames', 0, None)
+    with pytest.raises(Reticle2EncodeError):
+        patch(path, 'small', 0, None)
+    with pytest.raises(Reticle2EncodeError):
+        patch(path, 'base', 0, loads(original).base)
+    assert path.read_bytes() == original
+    assert original[:4] == PXL8ID
+
+
+def test_patch_mmap_frames(tmp_path) -> None:
+    # frames larger than the file write buffer are written straight through to the mapping
+    y, x = np.divmod(np.arange(480 * 10), 10)
+    big = [Reticle2Frame(rle.pack_records(x * 20 + dx, y, 5).tobytes()) for dx in (0, 1)]
+    container = loads((ASSETS_DIR / 'example.pxl4').read_bytes())
+    container.base = Reticle2ListContainer(Reticle2(*big))
+    path = tmp_path / 'big.pxl4'
+    path.write_bytes(dumps(container))
+
+    mapped = load_mmap(path)
+    reticle = Reticle2(*reversed(mapped.base[0][:2]))
+    expected = loads(_expected(path.read_bytes(), 'base', 0, reticle))
+    patch(path, 'base', 0, reticle)
+    assert loads(path.read_bytes()) == expected
@@ -27,6 +27,7 @@ def test_dumps():
         d = loads(in_buf)
 
     out_buf = dumps(d)
+    assert in_buf == out_buf
     assert in_buf[:12] == out_buf[:12]
     assert in_buf[1036:] == out_buf[1036:]
     for i in range(32):
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from archerdfu.reticle2 import rle, load
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+def _encode_reference(img: Image.Image, size=(640, 480), threshold=127):
+    img = rle._adjust_img_size(img.convert('RGB'), size)
+    width, height = img.size
+    pixels = img.load()
+    buffer = b''
+    for y in range(height):
+        x = 0
+        while x < width:
+            if sum(pixels[x, y]) / 3 <= threshold:
+                start_x = x
+                while x < width and sum(pixels[x, y]) / 3 <= threshold:
+                    x += 1
+                buffer += rle.pack_record(start_x, y, x - start_x)
+            else:
+                x += 1
+    return img.size, buffer
+
+
+@pytest.mark.parametrize("file_path", [
+    ASSETS_DIR / 'sample1.bmp',
+    ASSETS_DIR / 'pxl4' / 'base_2_1.bmp',
+    ASSETS_DIR / 'pxl8' / 'base_1_1.bmp',
+])
+def test_encode_matches_reference(file_path):
+    img = Image.open(file_path)
+    assert rle.encode(img) == _encode_reference(img)
+
+
+def test_encode_threshold_and_resize():
+    img = Image.effect_noise((300, 500), 64).convert('RGB')
+    for threshold in (0, 100, 127, 200):
+        assert rle.encode(img, threshold=threshold) == _encode_reference(img, threshold=threshold)
+
+
+def test_encode_roundtrip():
+    with open(ASSETS_DIR / 'example.pxl4', 'rb') as fp:
+        container = load(fp)
+    for reticle in container.base:
+        for frame in reticle:
+            if frame is not None:
+                assert rle.encode(rle.decode(frame.rle))[1] == frame.rle
+
+
+def _decode_reference(buffer: bytes, size=(640, 480)):
+    width, height = size
+    img = Image.new('RGB', size, color='white')
+    pixels = img.load()
+    for n in range(0, len(buffer), 4):
+        x, y, count = rle.unpack_record(buffer[n:n + 4])
+        for i in range(count):
+            if 0 <= x + i < width and 0 <= y < height:
+                pixels[x + i, y] = (0, 0, 0)
+    return img
+
+
+@pytest.mark.parametrize("file_path", [ASSETS_DIR / 'dump.pxl4', ASSETS_DIR / 'example.pxl8'])
+def test_decode_matches_reference(file_path):
+    with open(file_path, 'rb') as fp:
+        container = load(fp, load_hold=True)
+    for reticles in container.values():
+        for reticle in reticles or ():
+            for frame in reticle:
+                if frame is not None:
+                    expected = _decode_reference(frame.rle).tobytes()
+                    assert rle.decode(frame.rle).tobytes() == expected
+                    assert rle.decode(frame.rle, mode='1').convert('RGB').tobytes() == expected
+
+
+def test_decode_clipping():
+    buf = b''.join(rle.pack_record(*r) for r in ((630, 0, 20), (0, 479, 640), (700, 10, 5), (0, 1000, 0), (5, 5, 0)))
+    assert rle.decode(buf).tobytes() == _decode_reference(buf).tobytes()
+    assert rle.rasterize(buf).sum() == 10 + 640
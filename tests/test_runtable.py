@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from archerdfu.reticle2 import load, rle, RunTable, Reticle2Frame, mkhold, mksmall, overlay, mkzooms
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+
+def _frames(file_path):
+    with open(file_path, 'rb') as fp:
+        container = load(fp)
+    return [f for reticle in container.base for f in reticle if f is not None and len(f)]
+
+
+def _bbox(mask):
+    ys, xs = np.nonzero(mask)
+    return int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
+
+
+@pytest.mark.parametrize("file_path", [ASSETS_DIR / 'example.pxl4', ASSETS_DIR / 'example.pxl8'])
+def test_runtable(file_path) -> None:
+    for frame in _frames(file_path):
+        runs = frame.runs
+        mask = rle.rasterize(frame.rle)
+
+        assert np.shares_memory(runs.records, np.frombuffer(frame.rle, np.uint8))
+        assert runs.to_rle() == frame.rle
+        assert RunTable.from_arrays(runs.x, runs.y, runs.q) == runs
+        assert len(runs) == len(frame) // 4
+        assert runs.pixel_count() == mask.sum()
+        assert runs.bbox() == _bbox(mask)
+        assert rle.rasterize(runs.row(240).to_rle()).sum() == mask[240].sum()
+
+        moved = rle.rasterize(runs.translate(-5, 7).to_rle())
+        expected = np.zeros_like(mask)
+        expected[7:, :-5] = mask[:-7, 5:]
+        assert (moved == expected).all()
+
+
+def test_runtable_frame() -> None:
+    runs = RunTable.from_arrays([10, 20], [1, 2], [5, 6])
+    frame = Reticle2Frame(runs)
+    assert frame.runs is runs
+    assert frame.rle == rle.pack_record(10, 1, 5) + rle.pack_record(20, 2, 6)
+    assert frame.img.getpixel((14, 1)) == (0, 0, 0)
+
+    frame.rle = mkhold((100, 200), 100, 1420).rle
+    assert frame.runs != runs
+    assert RunTable().bbox() is None
+    assert runs.translate(627, 0).bbox() == (637, 1, 640, 2)
+    assert len(runs.translate(0, 480)) == 0
+
+
+@pytest.mark.parametrize("op, expected", [
+    ('union', np.logical_or),
+    ('intersect', np.logical_and),
+    ('subtract', lambda a, b: a & ~b),
+    ('symmetric_difference', np.logical_xor),
+])
+def test_runtable_boolean(op, expected) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        a, b = (RunTable.from_arrays(rng.integers(0, 700, n), rng.integers(0, 500, n), rng.integers(0, 200, n))
+                for n in rng.integers(0, 300, 2))
+        result = getattr(a, op)(b)
+        assert (rle.rasterize(result.to_rle()) == expected(rle.rasterize(a.to_rle()), rle.rasterize(b.to_rle()))).all()
+        assert result.to_rle() == rle.encode(rle.decode(result.to_rle()))[1]
+
+
+def test_overlay() -> None:
+    small, hold = mksmall(), mkhold(tuple(range(100, 1000, 100)), 100, 1420)
+    frame = overlay(small, hold)
+    mask = rle.rasterize(small.rle) | rle.rasterize(hold.rle)
+    assert frame.rle == rle.encode(Image.fromarray(~mask))[1]
+    assert frame.runs == (small.runs | hold.runs) and frame.runs == frame.runs.normalize()
+    assert (small.runs - small.runs).bbox() is None
+
+
+def _scaled_reference(mask, factor, origin, down=False):
+    (ox, oy), (height, width) = origin, mask.shape
+    out = np.zeros_like(mask)
+    if down:
+        ys, xs = np.nonzero(mask)
+        ty, tx = oy + (ys - oy) // factor, ox + (xs - ox) // factor
+        ok = (ty >= 0) & (ty < height) & (tx >= 0) & (tx < width)
+        out[ty[ok], tx[ok]] = True
+    else:
+        ys, xs = np.mgrid[0:height, 0:width]
+        sy, sx = oy + (ys - oy) // factor, ox + (xs - ox) // factor
+        ok = (sy >= 0) & (sy < height) & (sx >= 0) & (sx < width)
+        out[ok] = mask[sy[ok], sx[ok]]
+    return out
+
+
+@pytest.mark.parametrize("origin", [(320, 240), (0, 0), (17, 401)])
+def test_runtable_transforms(origin) -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        n = rng.integers(0, 200)
+        runs = RunTable.from_arrays(rng.integers(0, 700, n), rng.integers(0, 500, n), rng.integers(0, 200, n))
+        mask = rle.rasterize(runs.to_rle())
+
+        assert (rle.rasterize(runs.flip_horizontal().to_rle()) == mask[:, ::-1]).all()
+        assert (rle.rasterize(runs.flip_vertical().to_rle()) == mask[::-1]).all()
+        for factor in (1, 2, 3):
+            scaled = runs.scale(factor, origin)
+            assert (rle.rasterize(scaled.to_rle()) == _scaled_reference(mask, factor, origin)).all()
+            assert scaled == scaled.normalize()
+            downscaled = runs.downscale(factor, origin)
+            assert (rle.rasterize(downscaled.to_rle()) == _scaled_reference(mask, factor, origin, True)).all()
+
+
+@pytest.mark.parametrize("file_path", [ASSETS_DIR / 'example.pxl4', ASSETS_DIR / 'example.pxl8'])
+def test_flip_canonical(file_path) -> None:
+    runs = RunTable.from_arrays([10, 100], [5, 5], [3, 3])
+    assert list(runs.flip_horizontal().x) == [537, 627]
+    for frame in _frames(file_path):
+        for flip, method in ((Image.Transpose.FLIP_LEFT_RIGHT, RunTable.flip_horizontal),
+                             (Image.Transpose.FLIP_TOP_BOTTOM, RunTable.flip_vertical)):
+            flipped = Reticle2Frame(method(frame.runs))
+            assert flipped == Reticle2Frame(frame.img.transpose(flip))
+            assert bytes(flipped.rle) == rle.encode(frame.img.transpose(flip))[1]
+
+
+def test_mkzooms() -> None:
+    master = mksmall()
+    reticle = mkzooms(master, 8)
+    assert reticle[0] is master
+    assert [f.runs.pixel_count() for f in reticle] == [master.runs.pixel_count() * z * z for z in range(1, 9)]
+    assert mkzooms(master, 4, factors=(1, 2))[2:] == [None] * 6
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from archerdfu.reticle2 import loads, dumps, Reticle2Writer, Reticle2Container, Reticle2ListContainer, Reticle2, \
+    PXL4ID, PXL8ID
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+TEST_FILES = [
+    ASSETS_DIR / 'dump.pxl4',
+    ASSETS_DIR / 'dump3.pxl8',
+    ASSETS_DIR / 'example.pxl4',
+    ASSETS_DIR / 'example.pxl8',
+]
+
+
+def _write(path, container, pxl_type, hold, dedup=False) -> bytes:
+    with open(path, 'wb') as fp:
+        with Reticle2Writer(fp, pxl_type, hold=hold, dedup=dedup,
+                            base=len(container.base or ()), lrf=len(container.lrf or ())) as writer:
+            for key in ('small', 'hold', 'base', 'lrf'):
+                for reticle in container[key] or ():
+                    writer.add(key, reticle)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("pxl_type", [PXL4ID, PXL8ID])
+@pytest.mark.parametrize("hold", [False, True])
+@pytest.mark.parametrize("file_path", TEST_FILES)
+def test_writer(file_path, hold, pxl_type, tmp_path) -> None:
+    container = loads(file_path.read_bytes(), load_hold=hold)
+    assert _write(tmp_path / 'out', container, pxl_type, hold) == dumps(container, pxl_type, dump_hold=hold)
+    assert (_write(tmp_path / 'out', container, pxl_type, hold, dedup=True)
+            == dumps(container, pxl_type, dump_hold=hold, dedup=True))
+
+
+def test_writer_order(tmp_path) -> None:
+    container = loads((ASSETS_DIR / 'example.pxl4').read_bytes())
+    with open(tmp_path / 'out', 'wb') as fp:
+        writer = Reticle2Writer(fp, base=1)
+        writer.add('small', container.small[0])
+        writer.add('base', container.base[0])
+        with pytest.raises(ValueError):
+            writer.add('small', container.small[0])
+        with pytest.raises(ValueError):
+            writer.add('base', container.base[0])
+        with pytest.raises(ValueError):
+            writer.add('frames', Reticle2())
+        with pytest.raises(TypeError):
+            writer.add('lrf', container.base)
+        writer.close()
+        with pytest.raises(ValueError):
+            writer.add('lrf', Reticle2())
+
+    r = loads((tmp_path / 'out').read_bytes())
+    assert r.small[0] == container.small[0] and r.base[0] == container.base[0]
+    assert len(r.base) == 1 and not r.lrf
+
+
+def test_writer_base_only(tmp_path) -> None:
+    container = loads((ASSETS_DIR / 'example.pxl4').read_bytes())
+    with open(tmp_path / 'out', 'wb') as fp, Reticle2Writer(fp, base=1) as writer:
+        writer.add('base', container.base[0])
+
+    r = loads((tmp_path / 'out').read_bytes())
+    assert len(r.small) == 20 and all(frame is None or not len(frame) for reticle in r.small for frame in reticle)
+    assert r.base[0] == container.base[0]
+
+
+def test_dumps_without_small(tmp_path) -> None:
+    container = loads((ASSETS_DIR / 'example.pxl4').read_bytes())
+    base_only = Reticle2Container(base=Reticle2ListContainer(container.base[0]))
+    buffer = dumps(base_only)
+    r = loads(buffer)
+    assert len(r.small) == 20 and r.base[0] == container.base[0]
+    assert _write(tmp_path / 'out', base_only, PXL4ID, False) == buffer